@@ -6,6 +6,14 @@ Run this after applying migration 0007_add_temperature_and_p4_flags.py
 This script converts existing integer security_state_flags values to binary format.
 """
 
+import struct
+
+# Records written per UPDATE statement
+BULK_UPDATE_BATCH_SIZE = 500
+
+# 8-byte little-endian flags value
+U64_LE_STRUCT = struct.Struct('<Q')
+
 def convert_security_flags_to_binary():
     """
     Convert existing integer security_state_flags to binary format
@@ -34,23 +42,39 @@ def convert_security_flags_to_binary():
     
     updated_count = 0
     error_count = 0
+    pending_records = []
     
-    for record in records_to_update:
+    def write_batch(batch):
+        """Write converted records in one bulk_update; count them only once stored"""
+        nonlocal updated_count, error_count
+        try:
+            GPSRecord.objects.bulk_update(batch, ['security_state_flags'])
+            updated_count += len(batch)
+            print(f"Processed {updated_count}/{total_records} records...")
+        except Exception as e:
+            print(f"Error writing batch of {len(batch)} records (ids {batch[0].id}-{batch[-1].id}): {e}")
+            error_count += len(batch)
+    
+    for record in records_to_update.iterator():
         try:
             # Check if the field is still an integer (not binary)
             if isinstance(record.security_state_flags, int):
                 # Convert integer to 8-byte binary (little-endian)
-                binary_value = record.security_state_flags.to_bytes(8, byteorder='little')
+                binary_value = U64_LE_STRUCT.pack(record.security_state_flags)
                 record.security_state_flags = binary_value
-                record.save(update_fields=['security_state_flags'])
-                updated_count += 1
-                
-                if updated_count % 100 == 0:
-                    print(f"Processed {updated_count}/{total_records} records...")
+                pending_records.append(record)
                     
         except Exception as e:
             print(f"Error converting record {record.id}: {e}")
             error_count += 1
+        
+        # Write converted records in batches instead of one save() per record
+        if len(pending_records) >= BULK_UPDATE_BATCH_SIZE:
+            write_batch(pending_records)
+            pending_records = []
+    
+    if pending_records:
+        write_batch(pending_records)
     
     print(f"Conversion complete!")
     print(f"Successfully converted: {updated_count} records")
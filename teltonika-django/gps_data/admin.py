@@ -11,6 +11,7 @@ class DeviceAdmin(admin.ModelAdmin):
     list_filter = ['is_active', 'created_at']
     search_fields = ['imei', 'device_name']
     readonly_fields = ['created_at', 'updated_at']
+    list_select_related = ['status']
     
     def record_count(self, obj):
         count = obj.gps_records.count()
@@ -42,6 +43,7 @@ class GPSRecordAdmin(admin.ModelAdmin):
         'gnss_status', 'created_at'
     ]
     search_fields = ['device__imei', 'device__device_name']
+    list_select_related = ['device']
     readonly_fields = [
         'created_at', 'formatted_coordinates', 'security_flags_summary', 'security_summary',
         'analog_voltage_1', 'analog_voltage_2', 'accelerometer_summary',
@@ -1,7 +1,14 @@
 from rest_framework import serializers
 from .models import Device, GPSRecord, DeviceStatus, APILog
+from django.db import transaction, DataError, IntegrityError
 from django.utils import timezone
 from datetime import datetime
+import logging
+
+logger = logging.getLogger('gps_data')
+
+# Rows per INSERT statement when storing a batch of GPS records
+BULK_CREATE_BATCH_SIZE = 500
 
 
 class DeviceSerializer(serializers.ModelSerializer):
@@ -73,6 +80,63 @@ class GPSRecordSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class BulkGPSRecordListSerializer(serializers.ListSerializer):
+    """Stores a batch of validated GPS records with one bulk insert"""
+    
+    @transaction.atomic
+    def create(self, validated_data):
+        """Create all GPS records in one transaction and update each device's status once"""
+        devices = {}
+        gps_records = []
+        
+        for item in validated_data:
+            imei = item['imei']
+            device = devices.get(imei)
+            if device is None:
+                device, created = Device.objects.get_or_create(
+                    imei=imei,
+                    defaults={'device_name': f'Device {imei}'}
+                )
+                devices[imei] = device
+            
+            gps_records.append(GPSRecord(**self.child.build_record_data(item, device)))
+        
+        try:
+            # Savepoint, so a failed bulk insert leaves the transaction usable for the fallback
+            with transaction.atomic():
+                stored_records = GPSRecord.objects.bulk_create(gps_records, batch_size=BULK_CREATE_BATCH_SIZE)
+        except (DataError, IntegrityError) as e:
+            logger.warning(f"Bulk insert of {len(gps_records)} GPS records failed, storing them one by one: {e}")
+            stored_records = self.create_one_by_one(gps_records)
+        
+        # Status reflects only the records that were actually stored, in posted order
+        device_records = {}
+        last_timestamps = {}
+        for gps_record in stored_records:
+            imei = gps_record.device.imei
+            device_records[imei] = device_records.get(imei, 0) + 1
+            last_timestamps[imei] = gps_record.timestamp
+        
+        for imei, record_count in device_records.items():
+            self.child.update_device_status(devices[imei], last_timestamps[imei], record_count)
+        
+        return stored_records
+    
+    def create_one_by_one(self, gps_records):
+        """Insert each record in its own savepoint so only rows the database rejects are lost"""
+        stored_records = []
+        for gps_record in gps_records:
+            # A rolled-back bulk insert may already have assigned primary keys
+            gps_record.pk = None
+            try:
+                with transaction.atomic():
+                    gps_record.save(force_insert=True)
+                stored_records.append(gps_record)
+            except (DataError, IntegrityError) as e:
+                logger.warning(f"Dropped GPS record for device {gps_record.device.imei} at {gps_record.timestamp}: {e}")
+        return stored_records
+
+
 class BulkGPSRecordSerializer(serializers.Serializer):
     """Serializer for bulk GPS data insertion"""
     imei = serializers.CharField(max_length=15)
@@ -104,14 +168,13 @@ class BulkGPSRecordSerializer(serializers.Serializer):
         
         return value
     
+    class Meta:
+        list_serializer_class = BulkGPSRecordListSerializer
+    
+    @transaction.atomic
     def create(self, validated_data):
-        """Create GPS record from bulk data"""
+        """Create a single GPS record and update its device status in one transaction"""
         imei = validated_data['imei']
-        timestamp = validated_data['timestamp']
-        priority = validated_data.get('priority', 0)
-        gps_data = validated_data.get('gps_data', {})
-        io_data = validated_data.get('io_data', {})
-        event_io_id = validated_data.get('event_io_id')
         
         # Get or create device
         device, created = Device.objects.get_or_create(
@@ -119,6 +182,21 @@ class BulkGPSRecordSerializer(serializers.Serializer):
             defaults={'device_name': f'Device {imei}'}
         )
         
+        # Create the GPS record
+        gps_record = GPSRecord.objects.create(**self.build_record_data(validated_data, device))
+        
+        self.update_device_status(device, validated_data['timestamp'], 1)
+        
+        return gps_record
+    
+    def build_record_data(self, validated_data, device):
+        """Map validated bulk data to GPSRecord field values"""
+        timestamp = validated_data['timestamp']
+        priority = validated_data.get('priority', 0)
+        gps_data = validated_data.get('gps_data', {})
+        io_data = validated_data.get('io_data', {})
+        event_io_id = validated_data.get('event_io_id')
+        
         # Map IO data to model fields
         record_data = {
             'device': device,
@@ -218,20 +296,18 @@ class BulkGPSRecordSerializer(serializers.Serializer):
         if other_io:
             record_data['other_io_data'] = other_io
         
-        # Create the GPS record
-        gps_record = GPSRecord.objects.create(**record_data)
-        
-        # Update device status
+        return record_data
+    
+    def update_device_status(self, device, timestamp, record_count):
+        """Record the latest GPS timestamp and add record_count to the device's total"""
         try:
             device_status = device.status
         except DeviceStatus.DoesNotExist:
             device_status = DeviceStatus.objects.create(device=device)
         
         device_status.last_gps_record = timestamp
-        device_status.total_records += 1
+        device_status.total_records += record_count
         device_status.save()
-        
-        return gps_record
 
 
 class DeviceStatusSerializer(serializers.ModelSerializer):
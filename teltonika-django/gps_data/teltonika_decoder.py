@@ -8,6 +8,19 @@ This module provides comprehensive decoding of Teltonika security state flags
 according to the official documentation.
 """
 
+def set_bits(flags):
+    """
+    Yield the positions of the set bits in the low 64 bits of flags, lowest first
+    
+    Clears the lowest set bit on each step, so only set bits are visited.
+    """
+    bits = flags & 0xFFFFFFFFFFFFFFFF
+    while bits:
+        lowest_bit = bits & -bits
+        yield lowest_bit.bit_length() - 1
+        bits ^= lowest_bit
+
+
 def decode_security_state_flags_p4(flags_value):
     """
     Decode Security State Flags P4 (IO517) according to Teltonika specification
@@ -163,8 +176,8 @@ def decode_security_state_flags_p4(flags_value):
     # Check for other active bits beyond the standard ones
     standard_bits = {0, 1, 2, 3, 4, 5, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 22, 23, 24, 25, 30, 31, 32, 39, 41, 44, 45}
     
-    for bit_pos in range(64):  # Check up to 64 bits
-        if (flags & (1 << bit_pos)) and bit_pos not in standard_bits:
+    for bit_pos in set_bits(flags):  # Only the set bits of the low 64
+        if bit_pos not in standard_bits:
             decoded_flags[f'unknown_bit_{bit_pos}'] = {
                 'active': True,
                 'description': f'Unknown flag at bit position {bit_pos}',
@@ -286,8 +299,8 @@ def decode_control_state_flags_p4(flags_value):
     # Check for other active bits beyond the standard ones
     standard_control_bits = {0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 24}
     
-    for bit_pos in range(64):  # Check up to 64 bits
-        if (flags & (1 << bit_pos)) and bit_pos not in standard_control_bits:
+    for bit_pos in set_bits(flags):  # Only the set bits of the low 64
+        if bit_pos not in standard_control_bits:
             decoded_flags[f'unknown_control_bit_{bit_pos}'] = {
                 'active': True,
                 'description': f'Unknown control flag at bit position {bit_pos}',
@@ -341,15 +354,14 @@ def decode_indicator_state_flags_p4(flags_value):
         7: 'indicator 8'
     }
     
-    for bit_pos in range(64):  # Check up to 64 bits
-        if flags & (1 << bit_pos):
-            flag_name = f'indicator_bit_{bit_pos}'
-            description = indicator_bit_descriptions.get(bit_pos, f'indicator flag at bit {bit_pos}')
-            decoded_flags[flag_name] = {
-                'active': True,
-                'description': description,
-                'bit_position': bit_pos
-            }
+    for bit_pos in set_bits(flags):  # Only the set bits of the low 64
+        flag_name = f'indicator_bit_{bit_pos}'
+        description = indicator_bit_descriptions.get(bit_pos, f'indicator flag at bit {bit_pos}')
+        decoded_flags[flag_name] = {
+            'active': True,
+            'description': description,
+            'bit_position': bit_pos
+        }
     
     return decoded_flags
 
@@ -554,8 +566,8 @@ def decode_security_state_flags_io132(flags_value):
     # Check for other active bits beyond the standard ones
     standard_io132_bits = {0, 1, 2, 3, 4, 5, 8, 9, 10, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31, 32, 34, 35, 36, 37, 38, 39, 40, 41, 42, 43, 44, 45, 46, 48, 49, 50, 51, 52}
     
-    for bit_pos in range(64):  # Check up to 64 bits
-        if (flags & (1 << bit_pos)) and bit_pos not in standard_io132_bits:
+    for bit_pos in set_bits(flags):  # Only the set bits of the low 64
+        if bit_pos not in standard_io132_bits:
             decoded_flags[f'unknown_io132_bit_{bit_pos}'] = {
                 'active': True,
                 'description': f'Unknown IO132 security flag at bit position {bit_pos}',
@@ -1,3 +1,47 @@
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .models import Device, GPSRecord, DeviceStatus
+
+
+class TeltonikaGPSDataViewTests(TestCase):
+    """Bulk GPS data endpoint used by the Teltonika service"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('teltonika_gps_data')
+
+    def gps_record(self, imei, minute, io_data):
+        return {
+            'imei': imei,
+            'timestamp': f'2024-01-01T10:{minute:02d}:00+03:00',
+            'priority': 0,
+            'gps_data': {
+                'latitude': 30.0444, 'longitude': 31.2357, 'altitude': 75,
+                'angle': 90, 'satellites': 9, 'speed': 40,
+            },
+            'io_data': {'io_data': io_data},
+            'event_io_id': 0,
+        }
+
+    def test_batch_with_out_of_range_io_value_keeps_valid_records(self):
+        """A row the database rejects is dropped alone; the rest of the batch is stored"""
+        batch = [
+            self.gps_record('867324001000001', 0, {'239': 1, '72': 215}),
+            # -2.5°C read as an unsigned 4-byte value doesn't fit the integer column
+            self.gps_record('867324001000001', 1, {'239': 1, '72': 2**32 - 25}),
+            self.gps_record('867324001000002', 2, {'239': 0, '240': 1}),
+        ]
+
+        response = self.client.post(self.url, batch, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['records_processed'], 3)
+        self.assertEqual(response.data['records_created'], 2)
+        self.assertEqual(GPSRecord.objects.count(), 2)
+        self.assertFalse(GPSRecord.objects.filter(timestamp__minute=1).exists())
+        self.assertEqual(GPSRecord.objects.get(device__imei='867324001000001').dallas_temperature_1, 215)
+
+        status = DeviceStatus.objects.get(device=Device.objects.get(imei='867324001000001'))
+        self.assertEqual(status.total_records, 1)
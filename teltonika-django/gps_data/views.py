@@ -6,7 +6,6 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.db import transaction
 from django.http import JsonResponse
 import time
 import json
@@ -16,7 +15,7 @@ import socket
 
 from .models import Device, GPSRecord, DeviceStatus, APILog, DeviceCommand
 from .serializers import (
-    DeviceSerializer, GPSRecordSerializer, BulkGPSRecordSerializer,
+    DeviceSerializer, GPSRecordSerializer, BulkGPSRecordSerializer, BulkGPSRecordListSerializer,
     DeviceStatusSerializer, TeltonikaDataSerializer
 )
 
@@ -39,15 +38,23 @@ class TeltonikaGPSDataView(APIView):
             
             # Handle both single record and bulk data
             if isinstance(request.data, list):
-                # Multiple records
-                records_processed = 0
-                records_created = 0
+                # Multiple records: validate each, then store the valid ones with one bulk insert
+                records_processed = len(request.data)
+                valid_records = []
+                
+                for record_data in request.data:
+                    serializer = BulkGPSRecordSerializer(data=record_data)
+                    if serializer.is_valid():
+                        valid_records.append(serializer.validated_data)
+                    else:
+                        logger.warning(f"Invalid GPS record data: {serializer.errors}")
                 
-                with transaction.atomic():
-                    for record_data in request.data:
-                        if self.process_single_record(record_data):
-                            records_created += 1
-                        records_processed += 1
+                # Records are already validated one by one above, so the list serializer's
+                # create() is called directly rather than validating the batch again via save()
+                records_created = 0
+                if valid_records:
+                    list_serializer = BulkGPSRecordListSerializer(child=BulkGPSRecordSerializer())
+                    records_created = len(list_serializer.create(valid_records))
                 
                 response_data = {
                     'status': 'success',
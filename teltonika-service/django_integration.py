@@ -13,6 +13,13 @@ import logging
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
 
+# Faster JSON encoding for batch payloads, used when installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger('django_integration')
 
 
@@ -23,7 +30,7 @@ class DBIntegration:
         self.api_base_url = api_base_url.rstrip('/')
         self.session = requests.Session()
         
-        # Queue for batch processing
+        # Queue for batch processing; each item is a list of records from one packet
         self.data_queue = queue.Queue(maxsize=1000)
         self.batch_size = 50
         self.batch_timeout = 5  # seconds
@@ -65,7 +72,7 @@ class DBIntegration:
                 # Try to get data with timeout
                 try:
                     data = self.data_queue.get(timeout=1)
-                    batch.append(data)
+                    batch.extend(data)
                     self.data_queue.task_done()
                 except queue.Empty:
                     pass
@@ -94,9 +101,15 @@ class DBIntegration:
         try:
             url = f"{self.api_base_url}/api/gps/"
             
+            # IO IDs are int keys; orjson only writes them with OPT_NON_STR_KEYS
+            if ORJSON_AVAILABLE:
+                payload = orjson.dumps(batch, option=orjson.OPT_NON_STR_KEYS)
+            else:
+                payload = json.dumps(batch)
+            
             response = self.session.post(
                 url,
-                json=batch,
+                data=payload,
                 headers={'Content-Type': 'application/json'},
                 timeout=30
             )
@@ -104,7 +117,7 @@ class DBIntegration:
             if response.status_code in [200, 201]:
                 self.total_sent += len(batch)
                 self.last_success = datetime.now(timezone.utc)
-                logger.debug(f"Successfully sent batch of {len(batch)} records")
+                logger.debug("Successfully sent batch of %d records", len(batch))
             else:
                 self.total_failed += len(batch)
                 self.last_error = f"HTTP {response.status_code}: {response.text}"
@@ -149,8 +162,8 @@ class DBIntegration:
             
             # Add to queue (non-blocking)
             try:
-                self.data_queue.put_nowait(record_data)
-                logger.debug(f"GPS record queued for device {imei}")
+                self.data_queue.put_nowait([record_data])
+                logger.debug("GPS record queued for device %s", imei)
                 return True
             except queue.Full:
                 logger.warning(f"Queue full, dropping GPS record for device {imei}")
@@ -162,6 +175,40 @@ class DBIntegration:
             self.total_failed += 1
             return False
     
+    def store_gps_records(self, records: List[Dict[str, Any]]) -> bool:
+        """
+        Store all GPS records from one AVL packet with a single queue operation
+        
+        Args:
+            records: Record dicts with imei, timestamp, priority, gps_data,
+                     io_data and event_io_id keys
+            
+        Returns:
+            bool: True if queued successfully, False otherwise
+        """
+        if not records:
+            return True
+            
+        try:
+            # Start worker if not running
+            if not self.running:
+                self.start_worker()
+            
+            # Add to queue (non-blocking)
+            try:
+                self.data_queue.put_nowait(records)
+                logger.debug("%d GPS records queued for device %s", len(records), records[0]['imei'])
+                return True
+            except queue.Full:
+                logger.warning(f"Queue full, dropping {len(records)} GPS records for device {records[0]['imei']}")
+                self.total_failed += len(records)
+                return False
+                
+        except Exception as e:
+            logger.error(f"Error queuing GPS records: {e}")
+            self.total_failed += len(records)
+            return False
+    
     def store_gps_record_immediate(self, imei: str, timestamp: datetime, 
                                   gps_data: Dict[str, Any], io_data: Dict[str, Any], 
                                   priority: int = 0, event_io_id: Optional[int] = None) -> bool:
@@ -201,7 +248,7 @@ class DBIntegration:
             if response.status_code in [200, 201]:
                 self.total_sent += 1
                 self.last_success = datetime.now(timezone.utc)
-                logger.debug(f"GPS record stored immediately for device {imei}")
+                logger.debug("GPS record stored immediately for device %s", imei)
                 return True
             else:
                 self.total_failed += 1
@@ -243,7 +290,7 @@ class DBIntegration:
             )
             
             if response.status_code == 200:
-                logger.debug(f"Device status updated for {imei}: {'connected' if is_connected else 'disconnected'}")
+                logger.debug("Device status updated for %s: %s", imei, 'connected' if is_connected else 'disconnected')
                 return True
             else:
                 logger.error(f"Failed to update device status: HTTP {response.status_code}")
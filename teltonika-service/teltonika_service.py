@@ -21,6 +21,7 @@ State values:
   ? = Ignore (don't change current state)
 """
 
+import asyncio
 import socket
 import struct
 import threading
@@ -29,17 +30,13 @@ import logging
 import json
 import os
 import signal
-import sys
-import socket
-import struct
-import threading
-import time
-import logging
-import json
-import os
-import signal
+import multiprocessing
 import sys
 import requests
+import functools
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from http.server import HTTPServer, BaseHTTPRequestHandler
@@ -54,17 +51,408 @@ except ImportError:
     API_INTEGRATION_AVAILABLE = False
     print("Warning: Django API integration not available")
 
+# Faster event loop, used when installed
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Faster JSON encoding for the GPS and device event logs, used when installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configuration
 CONFIG = {
     'host': '0.0.0.0',
     'port': 5000,
     'command_api_port': 5001,  # HTTP API port for receiving commands
+    'worker_threads': 8,  # Threads running packet handling off the event loop
+    'listener_processes': 1,  # >1 forks extra processes sharing the device port via SO_REUSEPORT; the first forwards commands to the others
+    'buffer_pool_size': 64,  # Receive buffers kept for reuse across connections
+    'connection_timeout': 30,  # Seconds a device may take to accept queued replies before it is dropped
+    'gps_file_log': True,  # Write each packet's records to gps_data.log as one JSON array line
     'log_dir': '/var/log/teltonika',
     'data_dir': '/var/lib/teltonika',
     'max_log_size': 10 * 1024 * 1024,  # 10MB
     'backup_count': 5
 }
 
+# GPS element layout: Longitude(4) + Latitude(4) + Altitude(2) + Angle(2) + Satellites(1) + Speed(2)
+# Coordinates are two's complement, so they unpack as signed ints
+GPS_ELEMENT_STRUCT = struct.Struct('!iiHHBH')
+# Timestamp(8) + Priority(1) + GPS element(15), read in one call per Codec8 record
+AVL_RECORD_HEADER_STRUCT = struct.Struct('!QBiiHHBH')
+# Truncated GPS elements: without the speed field, and coordinates only
+GPS_ELEMENT_NO_SPEED_STRUCT = struct.Struct('!iiHHB')
+GPS_COORDINATES_STRUCT = struct.Struct('!ii')
+
+# AVL packet header: Preamble(4) + Data field length(4) + Codec ID(1) + Number of data 1(1)
+AVL_HEADER_STRUCT = struct.Struct('!4sIBB')
+# Frame header read off the stream: Preamble(4) + Data field length(4)
+AVL_FRAME_HEADER_STRUCT = struct.Struct('!II')
+
+# Device timestamps and log times are reported in Egypt time (UTC+3)
+EGYPT_TZ = timezone(timedelta(hours=3))
+# Later device timestamps (ms) can't be represented as a datetime in EGYPT_TZ
+MAX_TIMESTAMP_MS = int(datetime(9999, 1, 1, tzinfo=timezone.utc).timestamp()) * 1000
+
+# Codec8 Extended IO element pairs: Event IO ID(2) + N total(2), and NX IO ID(2) + length(2)
+IO_EXTENDED_PAIR_STRUCT = struct.Struct('!HH')
+
+# Codec12 header: Preamble(4) + Data size(4) + Codec ID(1) + Quantity 1(1) + Type(1) + Command/Response size(4)
+CODEC12_HEADER_STRUCT = struct.Struct('!IIBBBI')
+
+# Big-endian unsigned integers read straight from the receive buffer
+U16_STRUCT = struct.Struct('!H')
+U32_STRUCT = struct.Struct('!I')
+U64_STRUCT = struct.Struct('!Q')
+
+# Per-connection receive buffer: larger than typical AVL packets, small
+# enough to stay off the allocator's mmap path
+RECV_BUFFER_SIZE = 16384
+# Preamble(4) + Data field length(4) + CRC(4) around the data field
+AVL_FRAME_OVERHEAD = 12
+# Larger frames mean the stream is out of sync; the connection is dropped
+MAX_AVL_PACKET_SIZE = 1024 * 1024
+
+# Kernel socket buffers for device connections, inherited from the listening socket
+SOCKET_RCVBUF = 256 * 1024
+SOCKET_SNDBUF = 64 * 1024
+# Accept backlog, sized for reconnect storms after a network outage
+LISTEN_BACKLOG = 1024
+# Linux only
+TCP_QUICKACK = getattr(socket, 'TCP_QUICKACK', None)
+
+
+def build_crc16_table(polynomial=0xA001):
+    """Precompute the byte-at-a-time lookup table for CRC-16/IBM"""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ polynomial
+            else:
+                crc >>= 1
+        table.append(crc)
+    return table
+
+
+CRC16_TABLE = build_crc16_table()
+
+
+@functools.lru_cache(maxsize=256)
+def codec8_io_struct(n1, n2, n4, n8):
+    """Compile one Struct for a whole Codec8 IO element of this shape, skipping the group counts"""
+    return struct.Struct('!BBx' + 'BB' * n1 + 'x' + 'BH' * n2 + 'x' + 'BI' * n4 + 'x' + 'BQ' * n8)
+
+
+@functools.lru_cache(maxsize=256)
+def codec8_extended_io_struct(n1, n2, n4, n8):
+    """Compile one Struct for the fixed-width part of a Codec8 Extended IO element, skipping the group counts"""
+    return struct.Struct('!HHxx' + 'HB' * n1 + 'xx' + 'HH' * n2 + 'xx' + 'HI' * n4 + 'xx' + 'HQ' * n8)
+
+
+# Unit suffixes appended by the IO value formatters in decode_io_parameters
+UNIT_MILLIAMPS = 'mA'
+UNIT_PERCENT = '%'
+UNIT_OF_FIVE = '/5'
+UNIT_KMH = ' km/h'
+UNIT_RPM = ' RPM'
+UNIT_CELSIUS = '°C'
+UNIT_LITRES_PER_HOUR = ' L/h'
+UNIT_METRES = ' m'
+UNIT_LITRES = ' L'
+UNIT_LITRES_PER_100KM = ' L/100km'
+UNIT_MILLI_G = ' mG'
+UNIT_PULSES = ' pulses'
+UNIT_MILLIMETRES = ' mm'
+UNIT_HERTZ = ' Hz'
+UNIT_KPA = ' kPa'
+UNIT_GRAMS_PER_SEC = ' g/sec'
+UNIT_SECONDS = ' sec'
+UNIT_MINUTES = ' min'
+UNIT_KM = ' km'
+
+# Names of the IO elements decode_io_parameters knows how to explain
+IO_MEANINGS = {
+    # Permanent I/O Elements - Core Status
+    239: "Ignition",
+    240: "Movement", 
+    80: "Data Mode",
+    21: "GSM Signal",
+    200: "Sleep Mode",
+    69: "GNSS Status",
+    181: "GNSS PDOP",
+    182: "GNSS HDOP",
+    66: "External Voltage",
+    24: "Speed",
+    205: "GSM Cell ID",
+    206: "GSM Area Code",
+    67: "Battery Voltage",
+    68: "Battery Current",
+    241: "Active GSM Operator",
+    199: "Trip Odometer",
+    16: "Total Odometer",
+    
+    # Digital/Analog Inputs
+    1: "Digital Input 1",
+    2: "Digital Input 2", 
+    3: "Digital Input 3",
+    9: "Analog Input 1",
+    6: "Analog Input 2",
+    179: "Digital Output 1",
+    180: "Digital Output 2",
+    380: "Digital output 3",
+    381: "Ground Sense",
+    
+    # Fuel and GPS Data
+    12: "Fuel Used GPS",
+    13: "Fuel Rate GPS",
+    
+    # Accelerometer
+    17: "Axis X",
+    18: "Axis Y", 
+    19: "Axis Z",
+    
+    # Device Info
+    11: "ICCID1",
+    14: "ICCID2",
+    10: "SD Status",
+    113: "Battery Level",
+    238: "User ID",
+    237: "Network Type",
+    
+    # Pulse Counters
+    4: "Pulse Counter Din1",
+    5: "Pulse Counter Din2",
+    
+    # Bluetooth
+    263: "BT Status",
+    264: "Barcode ID",
+    
+    # Movement Detection
+    303: "Instant Movement",
+    
+    # Temperature Sensors (Dallas)
+    72: "Dallas Temperature 1",
+    73: "Dallas Temperature 2", 
+    74: "Dallas Temperature 3",
+    75: "Dallas Temperature 4",
+    76: "Dallas Temperature ID 1",
+    77: "Dallas Temperature ID 2",
+    79: "Dallas Temperature ID 3", 
+    71: "Dallas Temperature ID 4",
+    78: "iButton",
+    207: "RFID",
+    
+    # Liquid Level Sensors
+    201: "LLS 1 Fuel Level",
+    202: "LLS 1 Temperature",
+    203: "LLS 2 Fuel Level", 
+    204: "LLS 2 Temperature",
+    210: "LLS 3 Fuel Level",
+    211: "LLS 3 Temperature",
+    212: "LLS 4 Fuel Level",
+    213: "LLS 4 Temperature", 
+    214: "LLS 5 Fuel Level",
+    215: "LLS 5 Temperature",
+    
+    # Performance
+    15: "Eco Score",
+    
+    # Sensor Data
+    327: "UL202-02 Sensor Fuel level",
+    483: "UL202-02 Sensor Status",
+    
+    # Position Data
+    387: "ISO6709 Coordinates",
+    636: "UMTS/LTE Cell ID",
+    
+    # Driver Data  
+    403: "Driver Name",
+    404: "Driver card license type",
+    405: "Driver Gender",
+    406: "Driver Card ID",
+    407: "Driver card expiration date", 
+    408: "Driver Card place of issue",
+    409: "Driver Status Event",
+    
+    # Speed Sensor
+    329: "AIN Speed",
+    
+    # MSP500 Data
+    500: "MSP500 vendor name",
+    501: "MSP500 vehicle number",
+    502: "MSP500 speed sensor",
+    
+    # Wake Reason
+    637: "Wake Reason",
+    
+    # EYE Sensor Data (Temperature, Humidity, etc.)
+    10800: "EYE Temperature 1", 10801: "EYE Temperature 2", 10802: "EYE Temperature 3", 10803: "EYE Temperature 4",
+    10804: "EYE Humidity 1", 10805: "EYE Humidity 2", 10806: "EYE Humidity 3", 10807: "EYE Humidity 4", 
+    10808: "EYE Magnet 1", 10809: "EYE Magnet 2", 10810: "EYE Magnet 3", 10811: "EYE Magnet 4",
+    10812: "EYE Movement 1", 10813: "EYE Movement 2", 10814: "EYE Movement 3", 10815: "EYE Movement 4",
+    10816: "EYE Pitch 1", 10817: "EYE Pitch 2", 10818: "EYE Pitch 3", 10819: "EYE Pitch 4",
+    10820: "EYE Low Battery 1", 10821: "EYE Low Battery 2", 10822: "EYE Low Battery 3", 10823: "EYE Low Battery 4",
+    10824: "EYE Battery Voltage 1", 10825: "EYE Battery Voltage 2", 10826: "EYE Battery Voltage 3", 10827: "EYE Battery Voltage 4",
+    10832: "EYE Roll 1", 10833: "EYE Roll 2", 10834: "EYE Roll 3", 10835: "EYE Roll 4",
+    10836: "EYE Movement count 1", 10837: "EYE Movement count 2", 10838: "EYE Movement count 3", 10839: "EYE Movement count 4",
+    10840: "EYE Magnet count 1", 10841: "EYE Magnet count 2", 10842: "EYE Magnet count 3", 10843: "EYE Magnet count 4",
+    
+    # Calibration
+    383: "AXL Calibration Status",
+    
+    # BLE RFID and Buttons
+    451: "BLE RFID #1", 452: "BLE RFID #2", 453: "BLE RFID #3", 454: "BLE RFID #4",
+    455: "BLE Button 1 state #1", 456: "BLE Button 1 state #2", 457: "BLE Button 1 state #3", 458: "BLE Button 1 state #4",
+    459: "BLE Button 2 state #1", 460: "BLE Button 2 state #2", 461: "BLE Button 2 state #3", 462: "BLE Button 2 state #4",
+    
+    # Frequency
+    622: "Frequency DIN1", 623: "Frequency DIN2",
+    
+    # Connectivity
+    1148: "Connectivity quality",
+    
+    # OBD Elements
+    256: "VIN", 30: "Number of DTC", 31: "Engine Load", 32: "Coolant Temperature", 33: "Short Fuel Trim",
+    34: "Fuel pressure", 35: "Intake MAP", 36: "Engine RPM", 37: "Vehicle Speed", 38: "Timing Advance",
+    39: "Intake Air Temperature", 40: "MAF", 41: "Throttle Position", 42: "Runtime since engine start",
+    43: "Distance Traveled MIL On", 44: "Relative Fuel Rail Pressure", 45: "Direct Fuel Rail Pressure",
+    46: "Commanded EGR", 47: "EGR Error", 48: "Fuel Level", 49: "Distance Since Codes Clear",
+    50: "Barometic Pressure", 51: "Control Module Voltage", 52: "Absolute Load Value", 759: "Fuel Type",
+    53: "Ambient Air Temperature", 54: "Time Run With MIL On", 55: "Time Since Codes Cleared",
+    56: "Absolute Fuel Rail Pressure", 57: "Hybrid battery pack life", 58: "Engine Oil Temperature",
+    59: "Fuel injection timing", 540: "Throttle position group", 541: "Commanded Equivalence R",
+    542: "Intake MAP 2 bytes", 543: "Hybrid System Voltage", 544: "Hybrid System Current",
+    281: "Fault Codes", 60: "Fuel Rate",
+    
+    # BLE Sensors
+    25: "BLE Temperature #1", 26: "BLE Temperature #2", 27: "BLE Temperature #3", 28: "BLE Temperature #4",
+    29: "BLE Battery #1", 20: "BLE Battery #2", 22: "BLE Battery #3", 23: "BLE Battery #4",
+    86: "BLE Humidity #1", 104: "BLE Humidity #2", 106: "BLE Humidity #3", 108: "BLE Humidity #4",
+    270: "BLE Fuel Level #1", 273: "BLE Fuel Level #2", 276: "BLE Fuel Level #3", 279: "BLE Fuel Level #4",
+    385: "Beacon",
+    
+    # CAN Bus Data (LVCAN200, ALLCAN300, CANCONTROL)
+    81: "Vehicle Speed (CAN)", 82: "Accelerator Pedal Position", 83: "Fuel Consumed (CAN)", 
+    84: "Fuel Level (CAN)", 85: "Engine RPM (CAN)", 87: "Total Mileage (CAN)", 89: "Fuel level (CAN %)",
+    90: "Door Status (CAN)", 100: "Program Number", 101: "Module ID 8B", 388: "Module ID 17B",
+    102: "Engine Worktime", 103: "Engine Worktime (counted)", 105: "Total Mileage (counted)",
+    107: "Fuel Consumed (counted)", 110: "Fuel Rate (CAN)", 111: "AdBlue Level (%)",
+    112: "AdBlue Level (L)", 114: "Engine Load (CAN)", 115: "Engine Temperature",
+    132: "Security State Flags",
+    
+    # P4 State Flags (8-byte binary data)
+    517: "Security State Flags P4",
+    518: "Control State Flags P4", 
+    519: "Indicator State Flags P4",
+}
+
+# "IOxxx: Name = " prefixes used by decode_io_parameters, built on first use of each IO ID
+IO_LABEL_CACHE = {}
+
+
+def unit_formatter(unit):
+    """Build an IO value formatter that appends a unit suffix"""
+    return lambda value: str(value) + unit
+
+
+def switch_formatter(on_text, off_text):
+    """Build an IO value formatter for 0/1 parameters"""
+    return lambda value: on_text if value else off_text
+
+
+def enum_formatter(names, fallback):
+    """Build an IO value formatter for enumerated parameters"""
+    return lambda value: names[value] if value in names else fallback.format(value)
+
+
+def format_door_status(value):
+    """Format the CAN door status bit field"""
+    door_statuses = [name for bit, name in DOOR_STATUS_BITS if value & bit]
+    return ", ".join(door_statuses) if door_statuses else "All Doors Closed"
+
+
+DOOR_STATUS_BITS = (
+    (0x01, "Driver Door Open"),
+    (0x02, "Passenger Door Open"),
+    (0x04, "Rear Left Door Open"),
+    (0x08, "Rear Right Door Open"),
+    (0x10, "Trunk Open"),
+    (0x20, "Hood Open"),
+)
+
+# State flag IOs are formatted by TeltonikaService.format_binary_flags
+STATE_FLAG_IO_IDS = (132, 517, 518, 519)
+
+# "bitN" labels of the set bits for every value of the two low flag bytes
+LOW_FLAG_BIT_LABELS = [tuple(f"bit{i}" for i in range(8) if byte & (1 << i)) for byte in range(256)]
+HIGH_FLAG_BIT_LABELS = [tuple(f"bit{i + 8}" for i in range(8) if byte & (1 << i)) for byte in range(256)]
+
+# (IO IDs, formatter) pairs for decode_io_parameters; IDs not listed are shown with str().
+# Fixed-precision and hex values use %-templates, which skip the per-call format spec parsing of f-strings
+IO_VALUE_FORMATTER_GROUPS = (
+    ((66, 67, 9, 6, 51), lambda value: "%.2fV" % (value / 1000)),  # External/Battery Voltage, Analog Inputs (mV)
+    ((68,), unit_formatter(UNIT_MILLIAMPS)),  # Battery Current
+    ((113, 31, 48, 89, 111, 114, 29, 20, 22, 23, 82, 41, 540, 46, 47, 57), unit_formatter(UNIT_PERCENT)),
+    ((21,), unit_formatter(UNIT_OF_FIVE)),  # GSM Signal (0-5 scale)
+    ((24, 37, 81), unit_formatter(UNIT_KMH)),  # Speed
+    ((36, 85), unit_formatter(UNIT_RPM)),  # Engine RPM
+    ((72, 73, 74, 75, 115), lambda value: "%.1f°C" % (value / 10)),  # Dallas/Engine Temperature (°C * 10)
+    ((32, 202, 204, 211, 213, 215, 39, 53, 58), unit_formatter(UNIT_CELSIUS)),
+    ((60, 110, 186), unit_formatter(UNIT_LITRES_PER_HOUR)),  # Fuel Rate
+    ((16, 87, 105), lambda value: "%.1f km" % (value / 1000)),  # Total Odometer/Mileage (m)
+    ((199,), unit_formatter(UNIT_METRES)),  # Trip Odometer
+    ((69,), enum_formatter({0: "Off", 1: "No Fix", 2: "2D Fix", 3: "3D Fix"}, "Unknown({})")),
+    ((80,), enum_formatter({0: "Home On Stop", 1: "Home On Moving", 2: "Universal", 3: "Ping", 4: "Manual", 5: "Unknown"}, "Mode {}")),
+    ((200,), enum_formatter({0: "No Sleep", 1: "GPS Sleep", 2: "Deep Sleep", 3: "Ultra Deep Sleep", 4: "Online Deep Sleep"}, "Sleep Mode {}")),
+    ((239,), switch_formatter("ON", "OFF")),  # Ignition
+    ((240,), switch_formatter("Moving", "Stopped")),  # Movement
+    ((1, 2, 3, 179, 180, 380), switch_formatter("HIGH", "LOW")),  # Digital inputs/outputs
+    ((181, 182), lambda value: "%.2f" % (value / 100)),  # GNSS PDOP/HDOP
+    ((12, 83, 107, 201, 203, 210, 212, 214, 84, 112), unit_formatter(UNIT_LITRES)),
+    ((13,), unit_formatter(UNIT_LITRES_PER_100KM)),  # Fuel Rate GPS
+    ((17, 18, 19), unit_formatter(UNIT_MILLI_G)),  # Accelerometer Axis
+    ((4, 5), unit_formatter(UNIT_PULSES)),  # Pulse Counter
+    ((327,), unit_formatter(UNIT_MILLIMETRES)),  # UL202-02 Sensor Fuel level
+    ((25, 26, 27, 28), lambda value: "%.2f°C" % (value / 100)),  # BLE Temperature
+    ((86, 104, 106, 108), lambda value: "%.1f%%RH" % (value / 10)),  # BLE Humidity
+    ((90,), format_door_status),  # Door Status (CAN)
+    ((100,), lambda value: f"Program #{value}"),
+    ((11, 14), "%016X".__mod__),  # ICCID1/ICCID2
+    ((237,), enum_formatter({0: "GSM", 1: "LTE"}, "Network Type {}")),
+    ((263,), enum_formatter({0: "Off", 1: "Enabled", 2: "Connected", 3: "Disconnected", 4: "Error"}, "BT Status {}")),
+    ((303,), switch_formatter("Moving", "Stationary")),  # Instant Movement
+    ((381,), switch_formatter("Grounded", "Not Grounded")),  # Ground Sense
+    ((383,), enum_formatter({0: "Not Calibrated", 1: "Calibration In Progress", 2: "Calibrated", 3: "Calibration Error"}, "Calibration Status {}")),
+    ((637,), enum_formatter({0: "Normal", 1: "Movement"}, "Wake Reason {}")),
+    ((451, 452, 453, 454, 78, 207), "0x%016X".__mod__),  # BLE RFID, iButton, RFID
+    ((455, 456, 457, 458, 459, 460, 461, 462), switch_formatter("Pressed", "Released")),  # BLE Buttons
+    ((622, 623), unit_formatter(UNIT_HERTZ)),  # Frequency DIN
+    ((10,), switch_formatter("SD Card Present", "No SD Card")),  # SD Status
+    ((238,), lambda value: f"User ID: {value}"),
+    ((387,), lambda value: f"ISO6709: 0x{value}"),
+    ((636,), lambda value: f"Cell ID: {value}"),
+    ((1148,), lambda value: f"Quality: {value}"),
+    ((256,), lambda value: f"VIN: {value}"),
+    ((264,), lambda value: f"Barcode: {value}"),
+    ((34, 35, 50, 44, 45, 56), unit_formatter(UNIT_KPA)),  # Pressures
+    ((40,), unit_formatter(UNIT_GRAMS_PER_SEC)),  # MAF
+    ((42,), unit_formatter(UNIT_SECONDS)),
+    ((54, 55), unit_formatter(UNIT_MINUTES)),
+    ((43, 49), unit_formatter(UNIT_KM)),
+    ((52,), lambda value: "%.1f%%" % (value / 100)),
+    ((59,), lambda value: "%.2f°" % (value / 100)),
+)
+
+IO_VALUE_FORMATTERS = {io_id: formatter for io_ids, formatter in IO_VALUE_FORMATTER_GROUPS for io_id in io_ids}
+
 
 class CommandAPIHandler(BaseHTTPRequestHandler):
     """HTTP API handler for receiving commands from Django"""
@@ -91,20 +479,22 @@ class CommandAPIHandler(BaseHTTPRequestHandler):
                     self.send_error(400, "IMEI and command are required")
                     return
                 
-                # Queue the command with type information
-                self.teltonika_service.queue_command(imei, command, command_id, command_type)
+                # Queue the command on the listener process holding the device
+                status_code, message = self.teltonika_service.dispatch_command(
+                    imei, command, command_id, command_type, data.get('forwarded', False)
+                )
                 
                 # Send response
                 response = {
-                    'status': 'success',
-                    'message': 'Command queued successfully',
+                    'status': 'success' if status_code == 200 else 'error',
+                    'message': message,
                     'imei': imei,
                     'command': command,
                     'command_id': command_id,
                     'command_type': command_type
                 }
                 
-                self.send_response(200)
+                self.send_response(status_code)
                 self.send_header('Content-Type', 'application/json')
                 self.end_headers()
                 self.wfile.write(json.dumps(response).encode('utf-8'))
@@ -123,7 +513,8 @@ class CommandAPIHandler(BaseHTTPRequestHandler):
                 response = {
                     'status': 'success',
                     'connected_devices': connected_devices,
-                    'total_connected': len(connected_devices)
+                    'total_connected': len(connected_devices),
+                    'total_connected_all_listeners': self.teltonika_service.total_connected_devices()
                 }
                 
                 self.send_response(200)
@@ -144,6 +535,7 @@ class CommandAPIHandler(BaseHTTPRequestHandler):
                 'status': 'healthy',
                 'service': 'teltonika',
                 'connected_devices': len(self.teltonika_service.connected_devices),
+                'connected_devices_all_listeners': self.teltonika_service.total_connected_devices(),
                 'pending_commands': sum(len(cmds) for cmds in self.teltonika_service.pending_commands.values())
             }
             
@@ -162,9 +554,10 @@ class CommandAPIHandler(BaseHTTPRequestHandler):
 class CommandAPIServer:
     """HTTP server for command API"""
     
-    def __init__(self, teltonika_service, port=5001):
+    def __init__(self, teltonika_service, port=5001, host='0.0.0.0'):
         self.teltonika_service = teltonika_service
         self.port = port
+        self.host = host
         self.server = None
         self.server_thread = None
     
@@ -174,7 +567,7 @@ class CommandAPIServer:
             # Create a custom handler class with teltonika_service reference
             handler_class = lambda *args: CommandAPIHandler(*args, self.teltonika_service)
             
-            self.server = HTTPServer(('0.0.0.0', self.port), handler_class)
+            self.server = HTTPServer((self.host, self.port), handler_class)
             self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
             self.server_thread.start()
             
@@ -191,24 +584,158 @@ class CommandAPIServer:
                 self.server_thread.join()
 
 
+class BufferPool:
+    """Thread-safe pool of fixed-size receive buffers reused across connections"""
+    
+    def __init__(self, count, size):
+        self.size = size
+        self.buffers = queue.LifoQueue(maxsize=count)
+        for _ in range(count):
+            self.buffers.put_nowait(bytearray(size))
+    
+    def acquire(self):
+        """Take a buffer from the pool, allocating a new one if it is empty"""
+        try:
+            return self.buffers.get_nowait()
+        except queue.Empty:
+            return bytearray(self.size)
+    
+    def release(self, buffer):
+        """Return a buffer to the pool, dropping it if the pool is full"""
+        try:
+            self.buffers.put_nowait(buffer)
+        except queue.Full:
+            pass
+
+
+class DeviceConnection:
+    """Socket-like handle for a device connection served by the event loop"""
+    
+    def __init__(self, client_socket, loop, send_timeout):
+        self.socket = client_socket
+        self.loop = loop
+        self.send_timeout = send_timeout
+        self.outgoing = asyncio.Queue()
+        self.closed = False
+    
+    def send(self, data):
+        """Queue data for the connection's writer; safe to call from any thread"""
+        if self.closed:
+            raise ConnectionError("Device connection is closed")
+        self.loop.call_soon_threadsafe(self.outgoing.put_nowait, bytes(data))
+        return len(data)
+    
+    def close(self):
+        """Stop accepting data and let the writer flush what is queued"""
+        self.closed = True
+        self.loop.call_soon_threadsafe(self.outgoing.put_nowait, None)
+    
+    async def write_loop(self):
+        """Send queued data in order until the connection is closed"""
+        outgoing = self.outgoing
+        closing = False
+        try:
+            while not closing:
+                data = await outgoing.get()
+                if data is None:
+                    break
+                
+                # Replies queued while the last send was in flight go out in one syscall
+                if not outgoing.empty():
+                    chunks = [data]
+                    while not outgoing.empty():
+                        data = outgoing.get_nowait()
+                        if data is None:
+                            closing = True
+                            break
+                        chunks.append(data)
+                    data = b''.join(chunks)
+                await asyncio.wait_for(self.loop.sock_sendall(self.socket, data), self.send_timeout)
+        except (OSError, asyncio.TimeoutError):
+            # The device stopped reading or went away; wake the reader so the connection is torn down
+            try:
+                self.socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        finally:
+            self.closed = True
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that tracks the file size itself and leaves flushing to its listener"""
+    
+    def __init__(self, filename, maxBytes=0, backupCount=0):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount)
+        self.bytes_written = os.path.getsize(self.baseFilename) if os.path.exists(self.baseFilename) else 0
+    
+    def emit(self, record):
+        # Sizes are counted in characters, so rollover happens at roughly maxBytes
+        try:
+            msg = self.format(record) + self.terminator
+            if self.maxBytes > 0 and self.bytes_written and self.bytes_written + len(msg) > self.maxBytes:
+                self.doRollover()
+                self.bytes_written = 0
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(msg)
+            self.bytes_written += len(msg)
+        except Exception:
+            self.handleError(record)
+
+
+class FlushingQueueListener(QueueListener):
+    """QueueListener that flushes its handlers whenever the queue runs dry"""
+    
+    def dequeue(self, block):
+        if block and self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+        return self.queue.get(block)
+    
+    def stop(self):
+        super().stop()
+        for handler in self.handlers:
+            handler.flush()
+
+
 class TeltonikaService:
     def __init__(self, config):
         self.config = config
+        self.worker_id = self.config.get('worker_id', 0)
         self.logger = None
         self.gps_logger = None
         self.socket = None
+        self.loop = None
+        self.serve_task = None
+        self.log_listener = None
+        self.gps_log_listener = None
+        self.event_logger = None
+        self.event_log_listener = None
+        self.buffer_pool = BufferPool(self.config.get('buffer_pool_size', 64), RECV_BUFFER_SIZE)
+        self.gps_file_log = self.config.get('gps_file_log', True)
+        self.event_log_file = self.log_path('device_events.log')
+        self.command_api_server = None
         self.running = True
         self.api_integration = None
         self.connected_devices = {}  # IMEI -> {socket, address, last_seen}
+        self.connection_count = self.config.get('connection_count')  # Shared across listener processes, if forked
         self.pending_commands = {}   # IMEI -> [command objects]
         self.active_commands = {}    # IMEI -> {command_id: command_info} for tracking responses
+        self.io_value_formatters = dict(IO_VALUE_FORMATTERS)
+        for io_id in STATE_FLAG_IO_IDS:
+            self.io_value_formatters[io_id] = functools.partial(self.format_binary_flags, io_id=io_id)
         
         # Setup logging and directories
         self.setup_directories()
         self.setup_logging()
         
-        # Initialize command API server
-        self.command_api_server = CommandAPIServer(self, self.config.get('command_api_port', 5001))
+        # Initialize command API server; extra listener processes serve a loopback-only port
+        # that the first process forwards commands to for devices it doesn't hold
+        command_api_port = self.config.get('command_api_port', 5001)
+        if self.worker_id == 0:
+            self.command_api_server = CommandAPIServer(self, command_api_port)
+        else:
+            self.command_api_server = CommandAPIServer(self, command_api_port + self.worker_id, '127.0.0.1')
         
         # Initialize API integration if available
         try:
@@ -223,11 +750,15 @@ class TeltonikaService:
         """Create necessary directories"""
         os.makedirs(self.config['log_dir'], exist_ok=True)
         os.makedirs(self.config['data_dir'], exist_ok=True)
+    
+    def log_path(self, name):
+        """Log file path; extra listener processes rotate their own files"""
+        if self.worker_id:
+            name = name.replace('.log', f'.{self.worker_id}.log')
+        return os.path.join(self.config['log_dir'], name)
         
     def setup_logging(self):
         """Setup simplified logging configuration"""
-        from logging.handlers import RotatingFileHandler
-        
         # Main application logger - only show essential information
         self.logger = logging.getLogger('teltonika_service')
         self.logger.setLevel(logging.INFO)
@@ -236,16 +767,16 @@ class TeltonikaService:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
         # Set timezone for logging
-        logging.Formatter.converter = lambda *args: datetime.now(timezone(timedelta(hours=3))).timetuple()
+        # (converts the record's own creation time, so queued records keep their timestamp)
+        logging.Formatter.converter = lambda *args: datetime.fromtimestamp(args[-1], EGYPT_TZ).timetuple()
         console_formatter = logging.Formatter(
             '%(asctime)s - %(message)s'
         )
         console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
         
         # File handler - clean output
-        log_file = os.path.join(self.config['log_dir'], 'teltonika_service.log')
-        file_handler = RotatingFileHandler(
+        log_file = self.log_path('teltonika_service.log')
+        file_handler = BufferedRotatingFileHandler(
             log_file,
             maxBytes=self.config['max_log_size'],
             backupCount=self.config['backup_count']
@@ -255,34 +786,51 @@ class TeltonikaService:
             '%(asctime)s - %(message)s'
         )
         file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(file_handler)
+        
+        # Callers only enqueue records; a listener thread writes them in batches
+        log_queue = queue.SimpleQueue()
+        self.logger.addHandler(QueueHandler(log_queue))
+        self.log_listener = FlushingQueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+        self.log_listener.start()
         
         # GPS data logger (separate file for GPS data)
         self.gps_logger = logging.getLogger('gps_data')
         self.gps_logger.setLevel(logging.INFO)
         
-        gps_log_file = os.path.join(self.config['log_dir'], 'gps_data.log')
-        gps_handler = RotatingFileHandler(
+        gps_log_file = self.log_path('gps_data.log')
+        gps_handler = BufferedRotatingFileHandler(
             gps_log_file,
             maxBytes=self.config['max_log_size'],
             backupCount=self.config['backup_count']
         )
         gps_formatter = logging.Formatter('%(asctime)s - %(message)s')
         gps_handler.setFormatter(gps_formatter)
-        self.gps_logger.addHandler(gps_handler)
+        
+        # Packet handlers only enqueue GPS records; a listener thread does the file I/O
+        gps_log_queue = queue.SimpleQueue()
+        self.gps_logger.addHandler(QueueHandler(gps_log_queue))
+        self.gps_log_listener = FlushingQueueListener(gps_log_queue, gps_handler, respect_handler_level=True)
+        self.gps_log_listener.start()
+        
+        # Device event log: one JSON object per line, kept open and written by a listener thread
+        self.event_logger = logging.getLogger('device_events')
+        self.event_logger.setLevel(logging.INFO)
+        
+        event_handler = BufferedRotatingFileHandler(self.event_log_file)
+        event_handler.setFormatter(logging.Formatter('%(message)s'))
+        
+        event_log_queue = queue.SimpleQueue()
+        self.event_logger.addHandler(QueueHandler(event_log_queue))
+        self.event_log_listener = FlushingQueueListener(event_log_queue, event_handler)
+        self.event_log_listener.start()
         
     def calculate_crc16(self, data):
         """Calculate CRC-16/IBM for data validation"""
         crc = 0x0000
-        polynomial = 0xA001
+        table = CRC16_TABLE
         
         for byte in data:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x0001:
-                    crc = (crc >> 1) ^ polynomial
-                else:
-                    crc >>= 1
+            crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
         return crc
     
 
@@ -290,12 +838,12 @@ class TeltonikaService:
     def handle_imei(self, client_socket, data, client_address):
         """Handle IMEI authentication"""
         try:
-            imei_length = struct.unpack('!H', data[:2])[0]
+            imei_length = U16_STRUCT.unpack_from(data)[0]
             
             if len(data) < 2 + imei_length:
                 return False
                 
-            imei = data[2:2+imei_length].decode('ascii')
+            imei = str(data[2:2+imei_length], 'ascii')
             
             # Accept the device (send 0x01)
             client_socket.send(b'\x01')
@@ -317,223 +865,169 @@ class TeltonikaService:
     
     def parse_gps_element(self, data, offset):
         """Parse GPS element from AVL data"""
-        try:
-            # Check how much data we actually have from the offset
-            available_bytes = len(data) - offset
-            
-            if available_bytes < 15:
-                # For incomplete GPS data, try to parse what we have
-                if available_bytes >= 13:
-                    # Try parsing with reduced format (missing last 2 bytes for speed)
-                    gps_bytes = data[offset:offset+13]
-                    # Parse without speed field: Longitude(4) + Latitude(4) + Altitude(2) + Angle(2) + Satellites(1)
-                    longitude, latitude, altitude, angle, satellites = struct.unpack('!IIHHB', gps_bytes)
-                    speed = 0  # Default speed when not available
-                elif available_bytes >= 8:
-                    # Minimal GPS data - just coordinates
-                    gps_bytes = data[offset:offset+8]
-                    longitude, latitude = struct.unpack('!II', gps_bytes)
-                    altitude = 0
-                    angle = 0
-                    satellites = 0
-                    speed = 0
-                else:
-                    return None
+        # Check how much data we actually have from the offset
+        available_bytes = len(data) - offset
+        
+        if available_bytes < 15:
+            # For incomplete GPS data, try to parse what we have
+            if available_bytes >= 13:
+                # Try parsing with reduced format (missing last 2 bytes for speed)
+                # Parse without speed field: Longitude(4) + Latitude(4) + Altitude(2) + Angle(2) + Satellites(1)
+                longitude, latitude, altitude, angle, satellites = GPS_ELEMENT_NO_SPEED_STRUCT.unpack_from(data, offset)
+                speed = 0  # Default speed when not available
+            elif available_bytes >= 8:
+                # Minimal GPS data - just coordinates
+                longitude, latitude = GPS_COORDINATES_STRUCT.unpack_from(data, offset)
+                altitude = 0
+                angle = 0
+                satellites = 0
+                speed = 0
             else:
-                # Normal parsing with full 15 bytes
-                gps_bytes = data[offset:offset+15]
-                longitude, latitude, altitude, angle, satellites, speed = struct.unpack('!IIHHBH', gps_bytes)
-            
-            # Convert coordinates to decimal degrees
-            longitude_deg = longitude / 10000000.0 if longitude != 0 else 0
-            latitude_deg = latitude / 10000000.0 if latitude != 0 else 0
-            
-            # Check if coordinates are negative (two's complement)
-            if longitude > 0x80000000:
-                longitude_deg = -(0x100000000 - longitude) / 10000000.0
-            if latitude > 0x80000000:
-                latitude_deg = -(0x100000000 - latitude) / 10000000.0
-            
-            gps_result = {
-                'longitude': longitude_deg,
-                'latitude': latitude_deg,
-                'altitude': altitude,
-                'angle': angle,
-                'satellites': satellites,
-                'speed': speed
-            }
-            
-            self.logger.debug(f"GPS parsed successfully: {gps_result}")
-            return gps_result
-            
-        except:
-            return None
+                return None
+        else:
+            # Normal parsing with full 15 bytes
+            longitude, latitude, altitude, angle, satellites, speed = GPS_ELEMENT_STRUCT.unpack_from(data, offset)
+        
+        gps_result = self.build_gps_data(longitude, latitude, altitude, angle, satellites, speed)
+        
+        self.logger.debug("GPS parsed successfully: %s", gps_result)
+        return gps_result
+    
+    def build_gps_data(self, longitude, latitude, altitude, angle, satellites, speed):
+        """Build the GPS data dict from raw GPS element fields"""
+        # Convert signed coordinates to decimal degrees
+        return {
+            'longitude': longitude / 10000000.0,
+            'latitude': latitude / 10000000.0,
+            'altitude': altitude,
+            'angle': angle,
+            'satellites': satellites,
+            'speed': speed
+        }
     
     def parse_io_element_codec8(self, data, offset):
-        """Parse IO element for Codec8"""
-        try:
-            event_io_id = data[offset]
-            n_total_io = data[offset + 1]
-            
-            current_offset = offset + 2
-            io_data = {}
-            
-            # Parse 1-byte IO elements
-            n1 = data[current_offset]
-            current_offset += 1
-            
-            for _ in range(n1):
-                io_id = data[current_offset]
-                io_value = data[current_offset + 1]
-                io_data[io_id] = io_value
-                current_offset += 2
-            
-            # Parse 2-byte IO elements
-            n2 = data[current_offset]
-            current_offset += 1
-            
-            for _ in range(n2):
-                io_id = data[current_offset]
-                io_value = struct.unpack('!H', data[current_offset + 1:current_offset + 3])[0]
-                io_data[io_id] = io_value
-                current_offset += 3
-            
-            # Parse 4-byte IO elements
-            n4 = data[current_offset]
-            current_offset += 1
-            
-            for _ in range(n4):
-                io_id = data[current_offset]
-                io_value = struct.unpack('!I', data[current_offset + 1:current_offset + 5])[0]
-                io_data[io_id] = io_value
-                current_offset += 5
-            
-            # Parse 8-byte IO elements
-            n8 = data[current_offset]
-            current_offset += 1
-            
-            for _ in range(n8):
-                io_id = data[current_offset]
-                io_value = struct.unpack('!Q', data[current_offset + 1:current_offset + 9])[0]
-                io_data[io_id] = io_value
-                current_offset += 9
-            
-            return {
-                'event_io_id': event_io_id,
-                'n_total_io': n_total_io,
-                'io_data': io_data
-            }, current_offset
-            
-        except:
+        """Parse IO element for Codec8; a truncated element returns None"""
+        data_length = len(data)
+        
+        # Walk the 1, 2, 4 and 8-byte group counts to find the element's shape
+        position = offset + 2
+        if position >= data_length:
+            return None, offset
+        n1 = data[position]
+        position += 1 + 2 * n1
+        if position >= data_length:
+            return None, offset
+        n2 = data[position]
+        position += 1 + 3 * n2
+        if position >= data_length:
+            return None, offset
+        n4 = data[position]
+        position += 1 + 5 * n4
+        if position >= data_length:
+            return None, offset
+        n8 = data[position]
+        position += 1 + 9 * n8
+        if position > data_length:
             return None, offset
+        
+        # Devices repeat a handful of shapes, so the whole element unpacks with one cached Struct
+        values = codec8_io_struct(n1, n2, n4, n8).unpack_from(data, offset)
+        
+        return {
+            'event_io_id': values[0],
+            'n_total_io': values[1],
+            'io_data': dict(zip(values[2::2], values[3::2]))
+        }, position
     
     def parse_codec8(self, data, imei):
-        """Parse Codec8 protocol data"""
-        try:
-            preamble = data[:4]
-            data_field_length = struct.unpack('!I', data[4:8])[0]
-            codec_id = data[8]
-            num_data_1 = data[9]
+        """Parse Codec8 protocol data; a malformed packet returns (None, 0)"""
+        preamble, data_field_length, codec_id, num_data_1 = AVL_HEADER_STRUCT.unpack_from(data)
+        
+        offset = 10
+        records = []
+        
+        # Bind per-record lookups once for the loop
+        data_length = len(data)
+        header_size = AVL_RECORD_HEADER_STRUCT.size
+        unpack_header = AVL_RECORD_HEADER_STRUCT.unpack_from
+        build_gps_data = self.build_gps_data
+        parse_io_element = self.parse_io_element_codec8
+        log_gps_data = self.log_gps_data
+        
+        for i in range(num_data_1):
+            if offset + header_size <= data_length:
+                # Timestamp (8 bytes) + Priority (1 byte) + GPS element (15 bytes) in one read
+                (timestamp, priority, longitude, latitude, altitude,
+                 angle, satellites, speed) = unpack_header(data, offset)
+                gps_data = build_gps_data(longitude, latitude, altitude, angle, satellites, speed)
+            elif offset + 9 <= data_length:
+                # Truncated record: parse what the GPS element has
+                timestamp = U64_STRUCT.unpack_from(data, offset)[0]
+                priority = data[offset + 8]
+                gps_data = self.parse_gps_element(data, offset + 9)
+            else:
+                return None, 0
             
-
+            if timestamp >= MAX_TIMESTAMP_MS:
+                return None, 0
             
-            offset = 10
-            records = []
+            # Convert to Egypt timezone (UTC+3)
+            dt = datetime.fromtimestamp(timestamp * 0.001, EGYPT_TZ)
             
-            for i in range(num_data_1):
-                # Parse timestamp (8 bytes)
-                timestamp = struct.unpack('!Q', data[offset:offset+8])[0]
-                # Convert to Egypt timezone (UTC+3)
-                egypt_tz = timezone(timedelta(hours=3))
-                dt = datetime.fromtimestamp(timestamp / 1000.0, tz=egypt_tz)
-                
-                # Parse priority (1 byte)
-                priority = data[offset + 8]
-                
-                # Parse GPS element (15 bytes)
-                gps_data = self.parse_gps_element(data, offset + 9)
-                
-                # Parse IO element
-                io_data, new_offset = self.parse_io_element_codec8(data, offset + 24)
-                
-                record = {
-                    'imei': imei,
-                    'timestamp': dt.isoformat(),
-                    'priority': priority,
-                    'gps': gps_data,
-                    'io': io_data
-                }
-                records.append(record)
-                
-                # Log GPS data
-                self.log_gps_data(imei, dt, gps_data, io_data)
-                
-                offset = new_offset
+            # Parse IO element
+            io_data, new_offset = parse_io_element(data, offset + 24)
             
-            return records, num_data_1
+            # Records are built in the shape the storage API expects
+            record = {
+                'imei': imei,
+                'timestamp': dt.isoformat(),
+                'priority': priority,
+                'gps_data': gps_data,
+                'io_data': io_data,
+                'event_io_id': None
+            }
+            records.append(record)
             
-        except:
-            return None, 0
+            # Log GPS data
+            log_gps_data(imei, dt, gps_data, io_data)
+            
+            offset = new_offset
+        
+        return records, num_data_1
     
     def parse_io_element_codec8_extended(self, data, offset):
         """Parse IO element for Codec8 Extended"""
         try:
-            event_io_id = struct.unpack('!H', data[offset:offset+2])[0]
-            n_total_io = struct.unpack('!H', data[offset+2:offset+4])[0]
+            unpack_pair = IO_EXTENDED_PAIR_STRUCT.unpack_from
+            unpack_u16 = U16_STRUCT.unpack_from
             
+            # Walk the 1, 2, 4 and 8-byte group counts to find the element's shape
             current_offset = offset + 4
-            io_data = {}
-            
-            # Parse 1-byte IO elements
-            n1 = struct.unpack('!H', data[current_offset:current_offset+2])[0]
-            current_offset += 2
-            
-            for _ in range(n1):
-                io_id = struct.unpack('!H', data[current_offset:current_offset+2])[0]
-                io_value = data[current_offset + 2]
-                io_data[io_id] = io_value
-                current_offset += 3
-            
-            # Parse 2-byte IO elements
-            n2 = struct.unpack('!H', data[current_offset:current_offset+2])[0]
-            current_offset += 2
-            
-            for _ in range(n2):
-                io_id = struct.unpack('!H', data[current_offset:current_offset+2])[0]
-                io_value = struct.unpack('!H', data[current_offset + 2:current_offset + 4])[0]
-                io_data[io_id] = io_value
-                current_offset += 4
-            
-            # Parse 4-byte IO elements
-            n4 = struct.unpack('!H', data[current_offset:current_offset+2])[0]
-            current_offset += 2
-            
-            for _ in range(n4):
-                io_id = struct.unpack('!H', data[current_offset:current_offset+2])[0]
-                io_value = struct.unpack('!I', data[current_offset + 2:current_offset + 6])[0]
-                io_data[io_id] = io_value
-                current_offset += 6
-            
-            # Parse 8-byte IO elements
-            n8 = struct.unpack('!H', data[current_offset:current_offset+2])[0]
-            current_offset += 2
-            
-            for _ in range(n8):
-                io_id = struct.unpack('!H', data[current_offset:current_offset+2])[0]
-                io_value = struct.unpack('!Q', data[current_offset + 2:current_offset + 10])[0]
-                io_data[io_id] = io_value
-                current_offset += 10
+            n1 = unpack_u16(data, current_offset)[0]
+            current_offset += 2 + 3 * n1
+            n2 = unpack_u16(data, current_offset)[0]
+            current_offset += 2 + 4 * n2
+            n4 = unpack_u16(data, current_offset)[0]
+            current_offset += 2 + 6 * n4
+            n8 = unpack_u16(data, current_offset)[0]
+            current_offset += 2 + 10 * n8
             
             # Parse variable length IO elements (NX)
-            nx = struct.unpack('!H', data[current_offset:current_offset+2])[0]
+            nx = unpack_u16(data, current_offset)[0]
             current_offset += 2
             
+            # Build the dict from all fixed-width pairs in one pass
+            values = codec8_extended_io_struct(n1, n2, n4, n8).unpack_from(data, offset)
+            event_io_id, n_total_io = values[0], values[1]
+            io_data = dict(zip(values[2::2], values[3::2]))
+            
+            # Slice values out of a memoryview so only the hex string is allocated
+            view = memoryview(data)
             for _ in range(nx):
-                io_id = struct.unpack('!H', data[current_offset:current_offset+2])[0]
-                io_length = struct.unpack('!H', data[current_offset+2:current_offset+4])[0]
-                io_value = data[current_offset+4:current_offset+4+io_length]
-                io_data[io_id] = io_value.hex()
-                current_offset += 4 + io_length
+                io_id, io_length = unpack_pair(data, current_offset)
+                current_offset += 4
+                io_data[io_id] = view[current_offset:current_offset + io_length].hex()
+                current_offset += io_length
             
             return {
                 'event_io_id': event_io_id,
@@ -547,43 +1041,42 @@ class TeltonikaService:
     def parse_codec8_extended(self, data, imei):
         """Parse Codec8 Extended protocol data"""
         try:
-            preamble = data[:4]
-            data_field_length = struct.unpack('!I', data[4:8])[0]
-            codec_id = data[8]
-            num_data_1 = data[9]
+            preamble, data_field_length, codec_id, num_data_1 = AVL_HEADER_STRUCT.unpack_from(data)
             
 
             
             offset = 10
             records = []
             
+            data_length = len(data)
+            header_size = AVL_RECORD_HEADER_STRUCT.size
+            unpack_header = AVL_RECORD_HEADER_STRUCT.unpack_from
+            
             for i in range(num_data_1):
-                # Parse timestamp (8 bytes)
-                if offset + 8 > len(data):
-                    break
-                    
-                timestamp = struct.unpack('!Q', data[offset:offset+8])[0]
-                # Convert to Egypt timezone (UTC+3)
-                egypt_tz = timezone(timedelta(hours=3))
-                dt = datetime.fromtimestamp(timestamp / 1000.0, tz=egypt_tz)
-                
-                # Parse priority (1 byte)
-                if offset + 9 > len(data):
-                    break
-                priority = data[offset + 8]
-                
-                # Parse GPS element
-                gps_offset = offset + 9
-                available_gps_bytes = len(data) - gps_offset
-                
-                if available_gps_bytes >= 15:
-                    gps_data = self.parse_gps_element(data, gps_offset)
-                    # If normal parsing fails, try extraction method
-                    if gps_data is None:
-                        gps_data = self.extract_gps_coordinates(data, gps_offset)
-                    io_offset = gps_offset + 15
+                if offset + header_size <= data_length:
+                    # Timestamp (8 bytes) + Priority (1 byte) + GPS element (15 bytes) in one read
+                    (timestamp, priority, longitude, latitude, altitude,
+                     angle, satellites, speed) = unpack_header(data, offset)
+                    dt = datetime.fromtimestamp(timestamp * 0.001, EGYPT_TZ)
+                    gps_data = self.build_gps_data(longitude, latitude, altitude, angle, satellites, speed)
+                    io_offset = offset + header_size
                 else:
-                    # Try to parse what we have
+                    # Parse timestamp (8 bytes)
+                    if offset + 8 > data_length:
+                        break
+                    
+                    timestamp = U64_STRUCT.unpack_from(data, offset)[0]
+                    # Convert to Egypt timezone (UTC+3)
+                    dt = datetime.fromtimestamp(timestamp * 0.001, EGYPT_TZ)
+                    
+                    # Parse priority (1 byte)
+                    if offset + 9 > data_length:
+                        break
+                    priority = data[offset + 8]
+                    
+                    # Parse what we have of the GPS element
+                    gps_offset = offset + 9
+                    available_gps_bytes = data_length - gps_offset
                     gps_data = self.parse_gps_element(data, gps_offset)
                     # If that fails, try extraction
                     if gps_data is None:
@@ -592,7 +1085,7 @@ class TeltonikaService:
                     io_offset = gps_offset + min(15, available_gps_bytes)
                 
                 # Parse IO element - Codec8 Extended format
-                if io_offset < len(data):
+                if io_offset < data_length:
                     io_data, new_offset = self.parse_io_element_codec8_extended(data, io_offset)
                     
 
@@ -605,8 +1098,9 @@ class TeltonikaService:
                     'imei': imei,
                     'timestamp': dt.isoformat(),
                     'priority': priority,
-                    'gps': gps_data,
-                    'io': io_data
+                    'gps_data': gps_data,
+                    'io_data': io_data,
+                    'event_io_id': None
                 }
                 records.append(record)
                 
@@ -627,16 +1121,15 @@ class TeltonikaService:
     def parse_codec12(self, data, imei):
         """Parse Codec12 protocol data (GPRS commands)"""
         try:
-            preamble = data[:4]
-            data_size = struct.unpack('!I', data[4:8])[0]
+            data_size = U32_STRUCT.unpack_from(data, 4)[0]
             codec_id = data[8]
             quantity_1 = data[9]
             message_type = data[10]
             
             if message_type == 0x05:  # Command from device to server (rare)
-                command_size = struct.unpack('!I', data[11:15])[0]
+                command_size = U32_STRUCT.unpack_from(data, 11)[0]
                 command = data[15:15+command_size]
-                command_text = command.decode('ascii', errors='ignore')
+                command_text = str(command, 'ascii', errors='ignore')
                 self.logger.info(f"Codec12 Command from device {imei}: {command_text}")
                 
                 # Send response
@@ -644,9 +1137,9 @@ class TeltonikaService:
                 return self.create_codec12_response(response)
                 
             elif message_type == 0x06:  # Response from device (to our commands)
-                response_size = struct.unpack('!I', data[11:15])[0]
+                response_size = U32_STRUCT.unpack_from(data, 11)[0]
                 response = data[15:15+response_size]
-                response_text = response.decode('ascii', errors='ignore')
+                response_text = str(response, 'ascii', errors='ignore')
                 self.logger.info(f"Codec12 Response from device {imei}: {response_text}")
                 
                 # Log the response
@@ -745,31 +1238,28 @@ class TeltonikaService:
             self.logger.error(f"Error in command fallback: {e}")
             return False
     
+    def build_codec12_packet(self, message_type, payload):
+        """Build a Codec12 packet in one preallocated buffer"""
+        size = len(payload)
+        header_size = CODEC12_HEADER_STRUCT.size
+        
+        # Header + command/response + Quantity 2(1) + CRC(4)
+        packet = bytearray(header_size + size + 5)
+        # Data size: codec_id(1) + quantity1(1) + type(1) + size(4) + payload + quantity2(1)
+        CODEC12_HEADER_STRUCT.pack_into(packet, 0, 0, size + 8, 0x0C, 0x01, message_type, size)
+        packet[header_size:header_size + size] = payload
+        packet[header_size + size] = 0x01  # Quantity 2
+        
+        # CRC from codec ID to quantity 2
+        crc = self.calculate_crc16(memoryview(packet)[8:header_size + size + 1])
+        U32_STRUCT.pack_into(packet, header_size + size + 1, crc)
+        
+        return bytes(packet)
+    
     def create_codec12_response(self, response_text):
         """Create Codec12 response packet"""
         try:
-            response_bytes = response_text.encode('ascii')
-            response_size = len(response_bytes)
-            
-            # Build response packet
-            packet = bytearray()
-            packet.extend(b'\x00\x00\x00\x00')  # Preamble
-            
-            data_size = 1 + 1 + 1 + 4 + response_size + 1  # codec_id + quantity + type + size + response + quantity
-            packet.extend(struct.pack('!I', data_size))  # Data size
-            packet.extend(b'\x0C')  # Codec ID
-            packet.extend(b'\x01')  # Quantity 1
-            packet.extend(b'\x06')  # Response type
-            packet.extend(struct.pack('!I', response_size))  # Response size
-            packet.extend(response_bytes)  # Response
-            packet.extend(b'\x01')  # Quantity 2
-            
-            # Calculate and append CRC
-            crc = self.calculate_crc16(packet[8:])  # CRC from codec ID
-            packet.extend(struct.pack('!I', crc))
-            
-            return bytes(packet)
-            
+            return self.build_codec12_packet(0x06, response_text.encode('ascii'))
         except:
             return None
     
@@ -821,28 +1311,7 @@ class TeltonikaService:
     def create_codec12_command(self, command_text):
         """Create Codec12 command packet to send to device"""
         try:
-            command_bytes = command_text.encode('ascii')
-            command_size = len(command_bytes)
-            
-            # Build command packet
-            packet = bytearray()
-            packet.extend(b'\x00\x00\x00\x00')  # Preamble
-            
-            # Calculate data size: codec_id(1) + quantity1(1) + type(1) + size(4) + command + quantity2(1)
-            data_size = 1 + 1 + 1 + 4 + command_size + 1
-            packet.extend(struct.pack('!I', data_size))  # Data size
-            packet.extend(b'\x0C')  # Codec ID
-            packet.extend(b'\x01')  # Quantity 1
-            packet.extend(b'\x05')  # Command type (0x05)
-            packet.extend(struct.pack('!I', command_size))  # Command size
-            packet.extend(command_bytes)  # Command
-            packet.extend(b'\x01')  # Quantity 2
-            
-            # Calculate and append CRC
-            crc = self.calculate_crc16(packet[8:])  # CRC from codec ID to quantity 2
-            packet.extend(struct.pack('!I', crc))
-            
-            return bytes(packet)
+            return self.build_codec12_packet(0x05, command_text.encode('ascii'))
             
         except Exception as e:
             self.logger.error(f"Error creating Codec12 command: {e}")
@@ -919,6 +1388,9 @@ class TeltonikaService:
 
     def add_connected_device(self, imei, client_socket, client_address):
         """Add device to connected devices list"""
+        if self.connection_count is not None and imei not in self.connected_devices:
+            with self.connection_count.get_lock():
+                self.connection_count.value += 1
         self.connected_devices[imei] = {
             'socket': client_socket,
             'address': client_address,
@@ -931,8 +1403,17 @@ class TeltonikaService:
         """Remove device from connected devices list"""
         if imei in self.connected_devices:
             del self.connected_devices[imei]
+            if self.connection_count is not None:
+                with self.connection_count.get_lock():
+                    self.connection_count.value -= 1
             self.logger.info(f"Device {imei} disconnected")
     
+    def total_connected_devices(self):
+        """Devices connected to all listener processes"""
+        if self.connection_count is not None:
+            return self.connection_count.value
+        return len(self.connected_devices)
+    
     def update_device_last_seen(self, imei):
         """Update last seen timestamp for a device"""
         if imei in self.connected_devices:
@@ -964,6 +1445,37 @@ class TeltonikaService:
         if not commands:
             del self.pending_commands[imei]
     
+    def dispatch_command(self, imei, command_text, command_id=None, command_type=None, forwarded=False):
+        """Queue a command on the listener process holding the device; returns (HTTP status, message)"""
+        listener_processes = self.config.get('listener_processes', 1)
+        if listener_processes == 1 or imei in self.connected_devices:
+            self.queue_command(imei, command_text, command_id, command_type)
+            return 200, 'Command queued successfully'
+        
+        # Which process an offline device reconnects to is up to the kernel, so with several
+        # listeners commands are only accepted for devices that are connected right now
+        if forwarded or self.worker_id:
+            return 409, f'Device {imei} is not connected to this listener process'
+        
+        command_api_port = self.config.get('command_api_port', 5001)
+        for worker_id in range(1, listener_processes):
+            try:
+                response = requests.post(f'http://127.0.0.1:{command_api_port + worker_id}/send_command', json={
+                    'imei': imei,
+                    'command': command_text,
+                    'command_id': command_id,
+                    'command_type': command_type,
+                    'forwarded': True
+                }, timeout=5)
+            except Exception as e:
+                self.logger.warning(f"Could not forward command for {imei} to listener process {worker_id}: {e}")
+                continue
+            if response.status_code == 200:
+                return 200, f'Command queued successfully on listener process {worker_id}'
+        
+        self.logger.warning(f"Command for {imei} rejected: device is not connected to any listener process")
+        return 409, f'Device {imei} is not connected to any listener process'
+    
     def queue_command(self, imei, command_text, command_id=None, command_type=None):
         """Queue a command for a device (if not connected, will send when it connects)"""
         command = {
@@ -988,46 +1500,50 @@ class TeltonikaService:
         if imei in self.connected_devices:
             self.check_pending_commands(imei)
 
-    def store_in_database(self, imei, timestamp, gps_data, io_data, priority=None, event_io_id=None):
-        """Store GPS data via fast API integration"""
-        if not self.api_integration:
+    def store_in_database(self, imei, records):
+        """Store all GPS records from one AVL packet via fast API integration"""
+        if not self.api_integration or not records:
             return
             
         try:
-            success = self.api_integration.store_gps_record(
-                imei=imei,
-                timestamp=timestamp,
-                gps_data=gps_data,
-                io_data=io_data,
-                priority=priority or 0,
-                event_io_id=event_io_id
-            )
+            rows = [record for record in records if record['gps_data']]
+            
+            success = self.api_integration.store_gps_records(rows)
             if success:
-                self.logger.debug(f"Successfully queued GPS data for {imei} via API")
+                self.logger.debug("Successfully queued %d GPS records for %s via API", len(rows), imei)
             else:
-                self.logger.warning(f"Failed to queue GPS data for {imei} via API")
+                self.logger.warning(f"Failed to queue {len(rows)} GPS records for {imei} via API")
         except Exception as e:
             self.logger.error(f"Error storing GPS data via API: {e}")
 
+    def log_gps_batch(self, imei, records):
+        """Log all GPS records from one AVL packet to the GPS file as a single JSON line"""
+        if not self.gps_file_log or not self.gps_logger.isEnabledFor(logging.INFO):
+            return
+        
+        gps_entries = [{
+            'imei': imei,
+            'timestamp': record['timestamp'],
+            'latitude': record['gps_data']['latitude'],
+            'longitude': record['gps_data']['longitude'],
+            'altitude': record['gps_data']['altitude'],
+            'angle': record['gps_data']['angle'],
+            'satellites': record['gps_data']['satellites'],
+            'speed': record['gps_data']['speed'],
+            'io_data': record['io_data']['io_data'] if record['io_data'] else {}
+        } for record in records if record['gps_data']]
+        
+        if gps_entries:
+            if ORJSON_AVAILABLE:
+                # IO IDs are int keys; orjson only writes them with OPT_NON_STR_KEYS
+                self.gps_logger.info(orjson.dumps(gps_entries, option=orjson.OPT_NON_STR_KEYS).decode())
+            else:
+                self.gps_logger.info(json.dumps(gps_entries))
+    
     def log_gps_data(self, imei, timestamp, gps_data, io_data):
-        """Log GPS data to file and console in clean format"""
-        if gps_data:
-            # Create GPS log entry for file
-            gps_entry = {
-                'imei': imei,
-                'timestamp': timestamp.isoformat(),
-                'latitude': gps_data['latitude'],
-                'longitude': gps_data['longitude'],
-                'altitude': gps_data['altitude'],
-                'angle': gps_data['angle'],
-                'satellites': gps_data['satellites'],
-                'speed': gps_data['speed'],
-                'io_data': io_data['io_data'] if io_data else {}
-            }
-            
-            # Log to GPS file
-            self.gps_logger.info(json.dumps(gps_entry))
-            
+        """Log clean GPS data summary to console"""
+        # The summary decodes every IO parameter; skip it when INFO is filtered out
+        if gps_data and self.logger.isEnabledFor(logging.INFO):
             # Log clean summary to console
             self.logger.info(f"Device IMEI: {imei}")
             self.logger.info(f"GPS Coordinates: Lat {gps_data['latitude']:.6f}, Lon {gps_data['longitude']:.6f}")
@@ -1042,24 +1558,21 @@ class TeltonikaService:
                         self.logger.info(f"  {param}")
             
             self.logger.info("---")
-            
-            # Store in database
-            self.store_in_database(imei, timestamp, gps_data, io_data)
     
     def log_device_event(self, imei, event, data):
         """Log device events to file"""
         # Use Egypt timezone (UTC+3)
-        egypt_tz = timezone(timedelta(hours=3))
         event_entry = {
             'imei': imei,
-            'timestamp': datetime.now(tz=egypt_tz).isoformat(),
+            'timestamp': datetime.now(EGYPT_TZ).isoformat(),
             'event': event,
             'data': str(data)
         }
         
-        event_file = os.path.join(self.config['log_dir'], 'device_events.log')
-        with open(event_file, 'a') as f:
-            f.write(f"{json.dumps(event_entry)}\n")
+        if ORJSON_AVAILABLE:
+            self.event_logger.info(orjson.dumps(event_entry).decode())
+        else:
+            self.event_logger.info(json.dumps(event_entry))
     
     def handle_avl_data(self, client_socket, data, imei):
         """Handle AVL data packet"""
@@ -1099,70 +1612,162 @@ class TeltonikaService:
             else:
                 return
             
+            # Log and store every record of the packet in one call each
+            if records:
+                self.log_gps_batch(imei, records)
+                self.store_in_database(imei, records)
+            
             # Send acknowledgment for AVL data
             if num_records > 0:
-                ack = struct.pack('!I', num_records)
+                ack = U32_STRUCT.pack(num_records)
                 client_socket.send(ack)
             
-        except:
-            pass
+        except Exception as e:
+            # Malformed packets aren't acknowledged, so the device resends them
+            self.logger.warning(f"Dropped AVL packet from {imei}: {e}")
+    
+    async def receive_exactly(self, loop, client_socket, view, filled, size):
+        """Receive into view until it holds at least size bytes; returns the byte count, or 0 on disconnect"""
+        while filled < size:
+            received = await loop.sock_recv_into(client_socket, view[filled:])
+            if not received:
+                return 0
+            filled += received
+        return filled
     
-    def handle_client(self, client_socket, client_address):
+    async def handle_client(self, client_socket, client_address):
         """Handle individual client connection"""
+        loop = asyncio.get_running_loop()
+        connection = DeviceConnection(client_socket, loop, self.config.get('connection_timeout', 30))
+        writer_task = loop.create_task(connection.write_loop())
         imei = None
         
+        # Packets are framed off the stream into this pooled buffer and handed to
+        # the handlers as a memoryview; the next receive waits until the handler returns
+        receive_buffer = self.buffer_pool.acquire()
+        receive_view = memoryview(receive_buffer)
+        buffer_size = len(receive_buffer)
+        
         try:
-            # First, expect IMEI
-            imei_data = client_socket.recv(1024)
-            if imei_data:
-                imei = self.handle_imei(client_socket, imei_data, client_address)
-                if not imei:
-                    return
+            # First, expect IMEI: Length(2) + IMEI
+            filled = await self.receive_exactly(loop, client_socket, receive_view, 0, 2)
+            if not filled:
+                return
+            packet_size = min(2 + U16_STRUCT.unpack_from(receive_buffer)[0], buffer_size)
+            filled = await self.receive_exactly(loop, client_socket, receive_view, filled, packet_size)
+            if not filled:
+                return
+            imei = await loop.run_in_executor(
+                None, self.handle_imei, connection, receive_view[:packet_size], client_address
+            )
+            if not imei:
+                return
             
-            # Then handle AVL data packets
+            # Then handle AVL data packets; parsing, logging and command
+            # handling block, so they run on the worker threads
+            receive_exactly = self.receive_exactly
+            run_in_executor = loop.run_in_executor
+            handle_avl_data = self.handle_avl_data
             while self.running:
-                data = client_socket.recv(2048)
-                if not data:
+                # Keep any bytes of the next packet that arrived with the last one
+                filled -= packet_size
+                if filled:
+                    receive_buffer[:filled] = receive_buffer[packet_size:packet_size + filled]
+                
+                filled = await receive_exactly(loop, client_socket, receive_view, filled, 8)
+                if not filled:
                     break
                 
-                self.handle_avl_data(client_socket, data, imei)
+                preamble, data_length = AVL_FRAME_HEADER_STRUCT.unpack_from(receive_buffer)
+                packet_size = data_length + AVL_FRAME_OVERHEAD
+                if preamble != 0 or packet_size > MAX_AVL_PACKET_SIZE:
+                    self.logger.warning(f"Invalid packet header from {imei}, closing connection")
+                    break
+                
+                if packet_size <= buffer_size:
+                    filled = await receive_exactly(loop, client_socket, receive_view, filled, packet_size)
+                    if not filled:
+                        break
+                    packet = receive_view[:packet_size]
+                else:
+                    # Oversized packet: read the rest into its own buffer
+                    packet = memoryview(bytearray(packet_size))
+                    packet[:filled] = receive_view[:filled]
+                    if not await receive_exactly(loop, client_socket, packet, filled, packet_size):
+                        break
+                    filled = packet_size
+                
+                await run_in_executor(None, handle_avl_data, connection, packet, imei)
                 
         except:
             pass
         finally:
+            # Give the writer a bounded time to flush; wait_for cancels it after that
+            connection.close()
+            try:
+                await asyncio.wait_for(writer_task, connection.send_timeout)
+            except:
+                pass
             client_socket.close()
+            self.buffer_pool.release(receive_buffer)
             if imei:
                 self.remove_connected_device(imei)
                 self.log_device_event(imei, "DISCONNECTED", client_address)
     
-    def start_server(self):
-        """Start the TCP server and command API server"""
-        try:
-            # Start command API server
-            self.command_api_server.start()
-            
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.socket.bind((self.config['host'], self.config['port']))
-            self.socket.listen(10)
-            
-            self.logger.info(f"Teltonika Service started on {self.config['host']}:{self.config['port']}")
+    async def serve(self):
+        """Accept device connections on a single event loop"""
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=self.config.get('worker_threads', 8)))
+        self.loop = loop
+        self.serve_task = asyncio.current_task()
+        
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.config.get('listener_processes', 1) > 1:
+            # The kernel spreads accepted connections over all listener processes
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        # Set before listen() so accepted sockets inherit them and the window scale matches
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_SNDBUF)
+        self.socket.bind((self.config['host'], self.config['port']))
+        self.socket.listen(LISTEN_BACKLOG)
+        self.socket.setblocking(False)
+        
+        self.logger.info(f"Teltonika Service started on {self.config['host']}:{self.config['port']}")
+        if self.command_api_server:
             self.logger.info(f"Command API available on port {self.config.get('command_api_port', 5001)}")
-            
+        
+        try:
             while self.running:
                 try:
-                    client_socket, client_address = self.socket.accept()
+                    client_socket, client_address = await loop.sock_accept(self.socket)
+                    client_socket.setblocking(False)
+                    # Don't hold the small ACK and command writes back for Nagle
+                    client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    if TCP_QUICKACK is not None:
+                        try:
+                            client_socket.setsockopt(socket.IPPROTO_TCP, TCP_QUICKACK, 1)
+                        except OSError:
+                            pass
                     
-                    # Handle each client in a separate thread
-                    client_thread = threading.Thread(
-                        target=self.handle_client,
-                        args=(client_socket, client_address),
-                        daemon=True
-                    )
-                    client_thread.start()
+                    # Handle each client in its own coroutine
+                    loop.create_task(self.handle_client(client_socket, client_address))
                     
                 except socket.error:
                     pass
+        finally:
+            self.socket.close()
+    
+    def start_server(self):
+        """Start the TCP server and command API server"""
+        try:
+            # Start command API server
+            if self.command_api_server:
+                self.command_api_server.start()
+            
+            if UVLOOP_AVAILABLE:
+                asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            asyncio.run(self.serve())
                 
         except:
             pass
@@ -1172,12 +1777,26 @@ class TeltonikaService:
     def stop_server(self):
         """Stop the server gracefully"""
         self.running = False
-        if self.socket:
+        if self.loop and self.loop.is_running() and self.serve_task:
+            # The listening socket belongs to the event loop; let it close it
+            self.loop.call_soon_threadsafe(self.serve_task.cancel)
+        elif self.socket:
             self.socket.close()
         
         # Stop command API server
         if self.command_api_server:
             self.command_api_server.stop()
+        
+        # Flush queued log records to disk
+        if self.event_log_listener:
+            self.event_log_listener.stop()
+            self.event_log_listener = None
+        if self.gps_log_listener:
+            self.gps_log_listener.stop()
+            self.gps_log_listener = None
+        if self.log_listener:
+            self.log_listener.stop()
+            self.log_listener = None
     
     def signal_handler(self, signum, frame):
         """Handle system signals"""
@@ -1186,359 +1805,28 @@ class TeltonikaService:
 
     def decode_io_parameters(self, io_data):
         """Decode and explain IO parameters from Teltonika devices"""
-        io_meanings = {
-            # Permanent I/O Elements - Core Status
-            239: "Ignition",
-            240: "Movement", 
-            80: "Data Mode",
-            21: "GSM Signal",
-            200: "Sleep Mode",
-            69: "GNSS Status",
-            181: "GNSS PDOP",
-            182: "GNSS HDOP",
-            66: "External Voltage",
-            24: "Speed",
-            205: "GSM Cell ID",
-            206: "GSM Area Code",
-            67: "Battery Voltage",
-            68: "Battery Current",
-            241: "Active GSM Operator",
-            199: "Trip Odometer",
-            16: "Total Odometer",
-            
-            # Digital/Analog Inputs
-            1: "Digital Input 1",
-            2: "Digital Input 2", 
-            3: "Digital Input 3",
-            9: "Analog Input 1",
-            6: "Analog Input 2",
-            179: "Digital Output 1",
-            180: "Digital Output 2",
-            380: "Digital output 3",
-            381: "Ground Sense",
-            
-            # Fuel and GPS Data
-            12: "Fuel Used GPS",
-            13: "Fuel Rate GPS",
-            
-            # Accelerometer
-            17: "Axis X",
-            18: "Axis Y", 
-            19: "Axis Z",
-            
-            # Device Info
-            11: "ICCID1",
-            14: "ICCID2",
-            10: "SD Status",
-            113: "Battery Level",
-            238: "User ID",
-            237: "Network Type",
-            
-            # Pulse Counters
-            4: "Pulse Counter Din1",
-            5: "Pulse Counter Din2",
-            
-            # Bluetooth
-            263: "BT Status",
-            264: "Barcode ID",
-            
-            # Movement Detection
-            303: "Instant Movement",
-            
-            # Temperature Sensors (Dallas)
-            72: "Dallas Temperature 1",
-            73: "Dallas Temperature 2", 
-            74: "Dallas Temperature 3",
-            75: "Dallas Temperature 4",
-            76: "Dallas Temperature ID 1",
-            77: "Dallas Temperature ID 2",
-            79: "Dallas Temperature ID 3", 
-            71: "Dallas Temperature ID 4",
-            78: "iButton",
-            207: "RFID",
-            
-            # Liquid Level Sensors
-            201: "LLS 1 Fuel Level",
-            202: "LLS 1 Temperature",
-            203: "LLS 2 Fuel Level", 
-            204: "LLS 2 Temperature",
-            210: "LLS 3 Fuel Level",
-            211: "LLS 3 Temperature",
-            212: "LLS 4 Fuel Level",
-            213: "LLS 4 Temperature", 
-            214: "LLS 5 Fuel Level",
-            215: "LLS 5 Temperature",
-            
-            # Performance
-            15: "Eco Score",
-            
-            # Sensor Data
-            327: "UL202-02 Sensor Fuel level",
-            483: "UL202-02 Sensor Status",
-            
-            # Position Data
-            387: "ISO6709 Coordinates",
-            636: "UMTS/LTE Cell ID",
-            
-            # Driver Data  
-            403: "Driver Name",
-            404: "Driver card license type",
-            405: "Driver Gender",
-            406: "Driver Card ID",
-            407: "Driver card expiration date", 
-            408: "Driver Card place of issue",
-            409: "Driver Status Event",
-            
-            # Speed Sensor
-            329: "AIN Speed",
-            
-            # MSP500 Data
-            500: "MSP500 vendor name",
-            501: "MSP500 vehicle number",
-            502: "MSP500 speed sensor",
-            
-            # Wake Reason
-            637: "Wake Reason",
-            
-            # EYE Sensor Data (Temperature, Humidity, etc.)
-            10800: "EYE Temperature 1", 10801: "EYE Temperature 2", 10802: "EYE Temperature 3", 10803: "EYE Temperature 4",
-            10804: "EYE Humidity 1", 10805: "EYE Humidity 2", 10806: "EYE Humidity 3", 10807: "EYE Humidity 4", 
-            10808: "EYE Magnet 1", 10809: "EYE Magnet 2", 10810: "EYE Magnet 3", 10811: "EYE Magnet 4",
-            10812: "EYE Movement 1", 10813: "EYE Movement 2", 10814: "EYE Movement 3", 10815: "EYE Movement 4",
-            10816: "EYE Pitch 1", 10817: "EYE Pitch 2", 10818: "EYE Pitch 3", 10819: "EYE Pitch 4",
-            10820: "EYE Low Battery 1", 10821: "EYE Low Battery 2", 10822: "EYE Low Battery 3", 10823: "EYE Low Battery 4",
-            10824: "EYE Battery Voltage 1", 10825: "EYE Battery Voltage 2", 10826: "EYE Battery Voltage 3", 10827: "EYE Battery Voltage 4",
-            10832: "EYE Roll 1", 10833: "EYE Roll 2", 10834: "EYE Roll 3", 10835: "EYE Roll 4",
-            10836: "EYE Movement count 1", 10837: "EYE Movement count 2", 10838: "EYE Movement count 3", 10839: "EYE Movement count 4",
-            10840: "EYE Magnet count 1", 10841: "EYE Magnet count 2", 10842: "EYE Magnet count 3", 10843: "EYE Magnet count 4",
-            
-            # Calibration
-            383: "AXL Calibration Status",
-            
-            # BLE RFID and Buttons
-            451: "BLE RFID #1", 452: "BLE RFID #2", 453: "BLE RFID #3", 454: "BLE RFID #4",
-            455: "BLE Button 1 state #1", 456: "BLE Button 1 state #2", 457: "BLE Button 1 state #3", 458: "BLE Button 1 state #4",
-            459: "BLE Button 2 state #1", 460: "BLE Button 2 state #2", 461: "BLE Button 2 state #3", 462: "BLE Button 2 state #4",
-            
-            # Frequency
-            622: "Frequency DIN1", 623: "Frequency DIN2",
-            
-            # Connectivity
-            1148: "Connectivity quality",
-            
-            # OBD Elements
-            256: "VIN", 30: "Number of DTC", 31: "Engine Load", 32: "Coolant Temperature", 33: "Short Fuel Trim",
-            34: "Fuel pressure", 35: "Intake MAP", 36: "Engine RPM", 37: "Vehicle Speed", 38: "Timing Advance",
-            39: "Intake Air Temperature", 40: "MAF", 41: "Throttle Position", 42: "Runtime since engine start",
-            43: "Distance Traveled MIL On", 44: "Relative Fuel Rail Pressure", 45: "Direct Fuel Rail Pressure",
-            46: "Commanded EGR", 47: "EGR Error", 48: "Fuel Level", 49: "Distance Since Codes Clear",
-            50: "Barometic Pressure", 51: "Control Module Voltage", 52: "Absolute Load Value", 759: "Fuel Type",
-            53: "Ambient Air Temperature", 54: "Time Run With MIL On", 55: "Time Since Codes Cleared",
-            56: "Absolute Fuel Rail Pressure", 57: "Hybrid battery pack life", 58: "Engine Oil Temperature",
-            59: "Fuel injection timing", 540: "Throttle position group", 541: "Commanded Equivalence R",
-            542: "Intake MAP 2 bytes", 543: "Hybrid System Voltage", 544: "Hybrid System Current",
-            281: "Fault Codes", 60: "Fuel Rate",
-            
-            # BLE Sensors
-            25: "BLE Temperature #1", 26: "BLE Temperature #2", 27: "BLE Temperature #3", 28: "BLE Temperature #4",
-            29: "BLE Battery #1", 20: "BLE Battery #2", 22: "BLE Battery #3", 23: "BLE Battery #4",
-            86: "BLE Humidity #1", 104: "BLE Humidity #2", 106: "BLE Humidity #3", 108: "BLE Humidity #4",
-            270: "BLE Fuel Level #1", 273: "BLE Fuel Level #2", 276: "BLE Fuel Level #3", 279: "BLE Fuel Level #4",
-            385: "Beacon",
-            
-            # CAN Bus Data (LVCAN200, ALLCAN300, CANCONTROL)
-            81: "Vehicle Speed (CAN)", 82: "Accelerator Pedal Position", 83: "Fuel Consumed (CAN)", 
-            84: "Fuel Level (CAN)", 85: "Engine RPM (CAN)", 87: "Total Mileage (CAN)", 89: "Fuel level (CAN %)",
-            90: "Door Status (CAN)", 100: "Program Number", 101: "Module ID 8B", 388: "Module ID 17B",
-            102: "Engine Worktime", 103: "Engine Worktime (counted)", 105: "Total Mileage (counted)",
-            107: "Fuel Consumed (counted)", 110: "Fuel Rate (CAN)", 111: "AdBlue Level (%)",
-            112: "AdBlue Level (L)", 114: "Engine Load (CAN)", 115: "Engine Temperature",
-            132: "Security State Flags",
-            
-            # P4 State Flags (8-byte binary data)
-            517: "Security State Flags P4",
-            518: "Control State Flags P4", 
-            519: "Indicator State Flags P4",
-        }
-        
         decoded_params = []
         unknown_params = []
+        decoded_append = decoded_params.append
+        unknown_append = unknown_params.append
+        label_cache = IO_LABEL_CACHE
+        formatters = self.io_value_formatters
+        
+        meanings = IO_MEANINGS
         
         for io_id, value in io_data.items():
-            if io_id in io_meanings:
-                param_name = io_meanings[io_id]
+            label = label_cache.get(io_id)
+            if io_id in meanings:
+                if label is None:
+                    label = label_cache[io_id] = f"IO{io_id:03d}: {meanings[io_id]} = "
                 
-                # Format values based on parameter type and CSV specifications
-                if io_id in [66, 67]:  # External/Battery Voltage (2 bytes, V)
-                    formatted_value = f"{value/1000:.2f}V"
-                elif io_id == 68:  # Battery Current (2 bytes, A) - but typically in mA
-                    formatted_value = f"{value}mA" 
-                elif io_id in [9, 6]:  # Analog Input 1&2 (2 bytes, V)
-                    formatted_value = f"{value/1000:.2f}V"
-                elif io_id == 113:  # Battery Level (1 byte, %)
-                    formatted_value = f"{value}%"
-                elif io_id == 21:  # GSM Signal (1 byte, 0-5 scale)
-                    formatted_value = f"{value}/5"
-                elif io_id in [24, 37, 81]:  # Speed (2 bytes, km/h)
-                    formatted_value = f"{value} km/h"
-                elif io_id in [36, 85]:  # Engine RPM (2 bytes, rpm)
-                    formatted_value = f"{value} RPM"
-                elif io_id in [31, 48, 89, 111, 114]:  # Engine Load, Fuel Level percentages (1 byte, %)
-                    formatted_value = f"{value}%"
-                elif io_id in [72, 73, 74, 75]:  # Dallas Temperature (4 bytes, °C) - signed, -55.0 to 115.0
-                    formatted_value = f"{value/10:.1f}°C"
-                elif io_id == 32:  # Coolant Temperature (1 byte, °C, signed -128 to 127)
-                    formatted_value = f"{value}°C"
-                elif io_id in [60, 110, 186]:  # Fuel Rate (2 bytes, L/h)
-                    formatted_value = f"{value} L/h"
-                elif io_id == 16:  # Total Odometer (4 bytes, no unit specified, but typically meters)
-                    formatted_value = f"{value/1000:.1f} km"
-                elif io_id == 199:  # Trip Odometer (4 bytes, m)
-                    formatted_value = f"{value} m"
-                elif io_id in [87, 105]:  # Total Mileage CAN (4 bytes, m)
-                    formatted_value = f"{value/1000:.1f} km"
-                elif io_id == 69:  # GNSS Status (1 byte, 0-3)
-                    gnss_status = {0: "Off", 1: "No Fix", 2: "2D Fix", 3: "3D Fix"}
-                    formatted_value = gnss_status.get(value, f"Unknown({value})")
-                elif io_id == 80:  # Data Mode (1 byte, 0-5)
-                    data_modes = {0: "Home On Stop", 1: "Home On Moving", 2: "Universal", 3: "Ping", 4: "Manual", 5: "Unknown"}
-                    formatted_value = data_modes.get(value, f"Mode {value}")
-                elif io_id == 200:  # Sleep Mode (1 byte, 0-4)
-                    sleep_modes = {0: "No Sleep", 1: "GPS Sleep", 2: "Deep Sleep", 3: "Ultra Deep Sleep", 4: "Online Deep Sleep"}
-                    formatted_value = sleep_modes.get(value, f"Sleep Mode {value}")
-                elif io_id == 239:  # Ignition (1 byte, 0-1)
-                    formatted_value = "ON" if value else "OFF"
-                elif io_id == 240:  # Movement (1 byte, 0-1)
-                    formatted_value = "Moving" if value else "Stopped"
-                elif io_id in [1, 2, 3, 179, 180, 380]:  # Digital inputs/outputs (1 byte, 0-1)
-                    formatted_value = "HIGH" if value else "LOW"
-                elif io_id in [181, 182]:  # GNSS PDOP/HDOP (2 bytes, 0-500)
-                    formatted_value = f"{value/100:.2f}"
-                elif io_id in [205, 206]:  # GSM Cell ID/Area Code (2 bytes)
-                    formatted_value = f"{value}"
-                elif io_id == 241:  # Active GSM Operator (4 bytes)
-                    formatted_value = f"{value}"
-                elif io_id in [12, 83, 107]:  # Fuel consumed (4 bytes, L)
-                    formatted_value = f"{value} L"
-                elif io_id in [13]:  # Fuel Rate GPS (2 bytes, L/100km)
-                    formatted_value = f"{value} L/100km"
-                elif io_id in [17, 18, 19]:  # Accelerometer Axis (2 bytes, mG, signed -8000 to 8000)
-                    formatted_value = f"{value} mG"
-                elif io_id in [4, 5]:  # Pulse Counter (4 bytes)
-                    formatted_value = f"{value} pulses"
-                elif io_id == 15:  # Eco Score (2 bytes)
-                    formatted_value = f"{value}"
-                elif io_id in [201, 203, 210, 212, 214]:  # LLS Fuel Level (2 bytes, kvants or ltr, signed)
-                    formatted_value = f"{value} L"
-                elif io_id in [202, 204, 211, 213, 215]:  # LLS Temperature (1 byte, °C, signed -128 to 127)
-                    formatted_value = f"{value}°C"
-                elif io_id == 327:  # UL202-02 Sensor Fuel level (2 bytes, mm, signed)
-                    formatted_value = f"{value} mm"
-                elif io_id in [25, 26, 27, 28]:  # BLE Temperature (2 bytes, °C, signed -40.00 to 125.00)
-                    formatted_value = f"{value/100:.2f}°C"
-                elif io_id in [29, 20, 22, 23]:  # BLE Battery (1 byte, %)
-                    formatted_value = f"{value}%"
-                elif io_id in [86, 104, 106, 108]:  # BLE Humidity (2 bytes, %RH)
-                    formatted_value = f"{value/10:.1f}%RH"
-                elif io_id == 90:  # Door Status (CAN) - bit field
-                    door_statuses = []
-                    if value & 0x01: door_statuses.append("Driver Door Open")
-                    if value & 0x02: door_statuses.append("Passenger Door Open")
-                    if value & 0x04: door_statuses.append("Rear Left Door Open")
-                    if value & 0x08: door_statuses.append("Rear Right Door Open")
-                    if value & 0x10: door_statuses.append("Trunk Open")
-                    if value & 0x20: door_statuses.append("Hood Open")
-                    formatted_value = ", ".join(door_statuses) if door_statuses else "All Doors Closed"
-                elif io_id == 100:  # Program Number
-                    formatted_value = f"Program #{value}"
-                elif io_id in [11, 14]:  # ICCID1/ICCID2 (8 bytes, SIM card ID) - convert from hex
-                    # Convert to full ICCID format
-                    formatted_value = f"{value:016X}"
-                elif io_id == 237:  # Network Type (1 byte, 0-1)
-                    network_types = {0: "GSM", 1: "LTE"}
-                    formatted_value = network_types.get(value, f"Network Type {value}")
-                elif io_id == 263:  # BT Status (1 byte, 0-4)
-                    bt_statuses = {0: "Off", 1: "Enabled", 2: "Connected", 3: "Disconnected", 4: "Error"}
-                    formatted_value = bt_statuses.get(value, f"BT Status {value}")
-                elif io_id == 303:  # Instant Movement (1 byte, 0-1)
-                    formatted_value = "Moving" if value else "Stationary"
-                elif io_id == 381:  # Ground Sense (1 byte, 0-1)
-                    formatted_value = "Grounded" if value else "Not Grounded"
-                elif io_id == 383:  # AXL Calibration Status (1 byte, 0-3)
-                    cal_statuses = {0: "Not Calibrated", 1: "Calibration In Progress", 2: "Calibrated", 3: "Calibration Error"}
-                    formatted_value = cal_statuses.get(value, f"Calibration Status {value}")
-                elif io_id == 637:  # Wake Reason (1 byte, 0-1)
-                    wake_reasons = {0: "Normal", 1: "Movement"}
-                    formatted_value = wake_reasons.get(value, f"Wake Reason {value}")
-                elif io_id in [451, 452, 453, 454]:  # BLE RFID (8 bytes, HEX)
-                    formatted_value = f"0x{value:016X}"
-                elif io_id in [455, 456, 457, 458, 459, 460, 461, 462]:  # BLE Button states
-                    formatted_value = "Pressed" if value else "Released"
-                elif io_id in [622, 623]:  # Frequency DIN (2 bytes, Hz)
-                    formatted_value = f"{value} Hz"
-                elif io_id == 10:  # SD Status (1 byte, 0-1)
-                    formatted_value = "SD Card Present" if value else "No SD Card"
-                elif io_id == 78:  # iButton (8 bytes, HEX)
-                    formatted_value = f"0x{value:016X}"
-                elif io_id == 207:  # RFID (8 bytes, HEX)
-                    formatted_value = f"0x{value:016X}"
-                elif io_id == 238:  # User ID (8 bytes)
-                    formatted_value = f"User ID: {value}"
-                elif io_id == 387:  # ISO6709 Coordinates (34 bytes, HEX)
-                    formatted_value = f"ISO6709: 0x{value}"
-                elif io_id == 636:  # UMTS/LTE Cell ID (4 bytes)
-                    formatted_value = f"Cell ID: {value}"
-                elif io_id == 1148:  # Connectivity quality (4 bytes)
-                    formatted_value = f"Quality: {value}"
-                elif io_id == 256:  # VIN (variable length, ASCII)
-                    formatted_value = f"VIN: {value}"
-                elif io_id == 264:  # Barcode ID (variable length, ASCII)
-                    formatted_value = f"Barcode: {value}"
-                elif io_id in [82]:  # Accelerator Pedal Position (1 byte, %)
-                    formatted_value = f"{value}%"
-                elif io_id in [84, 112]:  # Fuel Level CAN (2 bytes, L)
-                    formatted_value = f"{value} L"
-                elif io_id == 115:  # Engine Temperature (2 bytes, °C, signed -60.0 to 127.0)
-                    formatted_value = f"{value/10:.1f}°C"
-                elif io_id in [34, 35, 50]:  # Pressures (fuel, intake MAP, barometric) in kPa
-                    formatted_value = f"{value} kPa"
-                elif io_id in [39, 53]:  # Air temperatures (1 byte, °C, signed)
-                    formatted_value = f"{value}°C"
-                elif io_id == 40:  # MAF (2 bytes, g/sec)
-                    formatted_value = f"{value} g/sec"
-                elif io_id in [41, 540]:  # Throttle Position (1 byte, %)
-                    formatted_value = f"{value}%"
-                elif io_id in [42, 54, 55]:  # Runtime/Time values (2 bytes, s or min)
-                    if io_id == 42:
-                        formatted_value = f"{value} sec"
-                    else:
-                        formatted_value = f"{value} min"
-                elif io_id in [43, 49]:  
-                    formatted_value = f"{value} km"
-                elif io_id in [44, 45, 56]: 
-                    formatted_value = f"{value} kPa"
-                elif io_id in [46, 47]: 
-                    formatted_value = f"{value}%"
-                elif io_id == 51: 
-                    formatted_value = f"{value/1000:.2f}V"
-                elif io_id == 52:  
-                    formatted_value = f"{value/100:.1f}%"
-                elif io_id == 57: 
-                    formatted_value = f"{value}%"
-                elif io_id == 58:  
-                    formatted_value = f"{value}°C"
-                elif io_id == 59:  
-                    formatted_value = f"{value/100:.2f}°"
-                elif io_id in [132, 517, 518, 519]:  # All State Flags (16-byte binary)
-                    formatted_value = self.format_binary_flags(value, io_id)
-                elif io_id == 72:  # Dallas Temperature 1 (°C * 10)
-                    formatted_value = f"{value/10:.1f}°C"
-                else:
-                    formatted_value = str(value)
-                    
-                decoded_params.append(f"IO{io_id:03d}: {param_name} = {formatted_value}")
+                formatter = formatters.get(io_id)
+                formatted_value = formatter(value) if formatter is not None else str(value)
+                decoded_append(label + formatted_value)
             else:
-                unknown_params.append(f"IO{io_id:03d}: Unknown parameter = {value}")
+                if label is None:
+                    label = label_cache[io_id] = f"IO{io_id:03d}: Unknown parameter = "
+                unknown_append(label + str(value))
         
         return decoded_params, unknown_params
 
@@ -1591,9 +1879,6 @@ class TeltonikaService:
         else:
             flags = int(flags_value)
         
-        # Convert to binary representation for storage/transmission (16 bytes for P4)
-        binary_data = flags.to_bytes(16, byteorder='little')
-        
         flag_names = {
             132: "Security",
             517: "Security P4",
@@ -1603,11 +1888,8 @@ class TeltonikaService:
         
         flag_type = flag_names.get(io_id, "Unknown P4")
         
-        # Show first few active bits for debugging
-        active_bits = []
-        for i in range(16):  # Check first 16 bits
-            if flags & (1 << i):
-                active_bits.append(f"bit{i}")
+        # Show the active bits among the first 16, one table lookup per byte
+        active_bits = LOW_FLAG_BIT_LABELS[flags & 0xFF] + HIGH_FLAG_BIT_LABELS[(flags >> 8) & 0xFF]
         
         if active_bits:
             return f"{flag_type}: {', '.join(active_bits)} (0x{flags:032X})"
@@ -1616,51 +1898,75 @@ class TeltonikaService:
 
     def extract_gps_coordinates(self, data, offset):
         """Extract GPS coordinates using the same method as GPS analysis"""
-        try:
-            available_bytes = len(data) - offset
-            if available_bytes >= 15:
-                gps_bytes = data[offset:offset+15]
-                
-                # Use the same method that worked in GPS analysis
-                longitude_raw = struct.unpack('!I', gps_bytes[0:4])[0]
-                latitude_raw = struct.unpack('!I', gps_bytes[4:8])[0]
-                altitude_raw = struct.unpack('!H', gps_bytes[8:10])[0]
-                angle_raw = struct.unpack('!H', gps_bytes[10:12])[0]
-                satellites_raw = gps_bytes[12]
-                speed_raw = struct.unpack('!H', gps_bytes[13:15])[0]
-                
-                longitude_deg = longitude_raw / 10000000.0
-                latitude_deg = latitude_raw / 10000000.0
-                
-                # Handle negative coordinates
-                if longitude_raw > 0x80000000:
-                    longitude_deg = -(0x100000000 - longitude_raw) / 10000000.0
-                if latitude_raw > 0x80000000:
-                    latitude_deg = -(0x100000000 - latitude_raw) / 10000000.0
-                
-                return {
-                    'longitude': longitude_deg,
-                    'latitude': latitude_deg,
-                    'altitude': altitude_raw,
-                    'angle': angle_raw,
-                    'satellites': satellites_raw,
-                    'speed': speed_raw
-                }
-            return None
-        except:
+        if len(data) - offset < 15:
             return None
+        
+        # Use the same method that worked in GPS analysis
+        longitude_raw, latitude_raw, altitude_raw, angle_raw, satellites_raw, speed_raw = \
+            GPS_ELEMENT_STRUCT.unpack_from(data, offset)
+        
+        return {
+            'longitude': longitude_raw / 10000000.0,
+            'latitude': latitude_raw / 10000000.0,
+            'altitude': altitude_raw,
+            'angle': angle_raw,
+            'satellites': satellites_raw,
+            'speed': speed_raw
+        }
+
+def stop_listener_processes(pids, signum=signal.SIGTERM):
+    """Signal the forked listener processes and wait for them to exit"""
+    for pid in pids:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+    for pid in pids:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+    pids.clear()
+
 
 def main():
     """Main service function"""
-    # Setup signal handlers
-    service = TeltonikaService(CONFIG)
-    signal.signal(signal.SIGTERM, service.signal_handler)
-    signal.signal(signal.SIGINT, service.signal_handler)
+    # Fork the extra listener processes before any threads or sockets exist
+    config = CONFIG
+    listener_processes = CONFIG.get('listener_processes', 1)
+    worker_pids = []
+    if listener_processes > 1:
+        # Shared memory, so every listener process sees the total number of connected devices
+        config = dict(CONFIG, connection_count=multiprocessing.Value('i', 0))
+    for worker_id in range(1, listener_processes):
+        pid = os.fork()
+        if pid == 0:
+            config = dict(config, worker_id=worker_id)
+            worker_pids = []
+            break
+        worker_pids.append(pid)
+    
+    service = TeltonikaService(config)
+    if listener_processes > 1 and not service.worker_id:
+        service.logger.warning(
+            f"listener_processes={listener_processes}: commands are only accepted for devices that are "
+            f"connected; commands for offline devices are rejected instead of queued"
+        )
+    
+    # Setup signal handlers; the first process passes them on to the listeners it forked
+    def handle_signal(signum, frame):
+        stop_listener_processes(worker_pids, signum)
+        service.signal_handler(signum, frame)
+    
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
     
     try:
         service.start_server()
     except KeyboardInterrupt:
         service.stop_server()
+    finally:
+        stop_listener_processes(worker_pids)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -4,16 +4,128 @@ Test script for Teltonika Service on port 5000
 Simulates real Teltonika device communication with GPS data
 """
 
+import asyncio
+import functools
+import http.client
 import socket
 import struct
 import time
-import threading
 import random
 import requests
 import json
 from datetime import datetime, timezone, timedelta
 
 
+# Precompiled big-endian field packers used by the Codec8 packet builder
+U32_STRUCT = struct.Struct('!I')
+
+# Timestamp(8) + Priority(1) + GPS element(15) packed in a single call per record
+RECORD_HEADER_STRUCT = struct.Struct('!QBIIHHBH')
+
+# IO ID(1) + value for each Codec8 IO element width
+IO1_STRUCT = struct.Struct('!BB')
+IO2_STRUCT = struct.Struct('!BH')
+IO4_STRUCT = struct.Struct('!BI')
+IO8_STRUCT = struct.Struct('!BQ')
+
+# Codec8 element width (bytes) of every IO parameter the simulator sends
+IO_SIZE = {
+    239: 1, 240: 1, 21: 1, 69: 1, 81: 1, 82: 1, 89: 1, 113: 1, 1: 1, 179: 1, 180: 1, 90: 1,
+    24: 2, 85: 2, 66: 2, 67: 2, 68: 2, 100: 2, 181: 2, 182: 2,
+    87: 4, 105: 4, 16: 4, 241: 4,
+    132: 8,
+}
+
+# IO parameters whose value never changes between records; packed once per
+# device and spliced into every record by create_codec8_packet
+STATIC_IO_DATA = {
+    69: 3,       # GNSS Status (3D Fix)
+    179: 0,      # Digital Output 1
+    100: 1,      # Program number
+    241: 62001,  # Active GSM operator
+}
+
+# Packer and value mask for each IO width, in Codec8 element order
+IO_WIDTHS = ((1, IO1_STRUCT, 0xFF), (2, IO2_STRUCT, 0xFFFF),
+             (4, IO4_STRUCT, 0xFFFFFFFF), (8, IO8_STRUCT, 0xFFFFFFFFFFFFFFFF))
+
+# Value ranges for the randomised IO parameters, in create_io_data unpack order
+IO_RANDOM_RANGES = (
+    range(0, 81),                   # IO24  Speed (GPS)
+    range(0, 86),                   # IO81  Vehicle Speed (CAN)
+    range(0, 101),                  # IO82  Accelerator Pedal Position %
+    range(800, 3501),               # IO85  Engine RPM (CAN)
+    range(24800000, 24810001),      # IO87  Total Mileage (CAN) in meters
+    range(20, 81),                  # IO89  Fuel Level (CAN) %
+    range(18070000, 18080001),      # IO105 Total Mileage Counted in meters
+    range(11000, 14501),            # IO66  External voltage (mV)
+    range(3600, 4201),              # IO67  Battery voltage (mV)
+    range(80, 101),                 # IO113 Battery level (%)
+    range(-100, 501),               # IO68  Battery current (mA)
+    range(100000, 1000000),         # IO16  Total odometer
+    range(0, 2),                    # IO1   Digital Input 1
+    range(10, 31),                  # IO181 GNSS PDOP
+    range(5, 16),                   # IO182 GNSS HDOP
+    range(0, 16),                   # IO90  Door status
+)
+
+
+def draw_io_random_rows(count, rng=random):
+    """Draw random IO values for a whole batch, one row per record"""
+    columns = [rng.choices(value_range, k=count) for value_range in IO_RANDOM_RANGES]
+    return list(zip(*columns))
+
+
+def split_io_data(io_data):
+    """Split a flat IO dict into (1-byte, 2-byte, 4-byte, 8-byte) buckets using IO_SIZE"""
+    buckets = ({}, {}, {}, {})
+    bucket_index = {1: 0, 2: 1, 4: 2, 8: 3}
+    for io_id, value in io_data.items():
+        size = IO_SIZE.get(io_id)
+        if size is not None:
+            buckets[bucket_index[size]][io_id] = value
+    return buckets
+
+
+def pack_static_io(io_data):
+    """Pre-pack fixed IO elements into a (count, bytes) pair per IO width"""
+    return tuple(
+        (len(bucket), b''.join(packer.pack(io_id, value & mask) for io_id, value in bucket.items()))
+        for bucket, (_, packer, mask) in zip(split_io_data(io_data), IO_WIDTHS)
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def record_struct(bucket_sizes, static_sizes):
+    """Compile one Struct that packs a whole AVL record for a given IO layout"""
+    # Record header + event IO ID(1) + total IO count(1), then for each width:
+    # count(1), the device's pre-packed static elements, and the ID/value pairs
+    fmt = [RECORD_HEADER_STRUCT.format, 'BB']
+    for count, (_, packer, _), static_size in zip(bucket_sizes, IO_WIDTHS, static_sizes):
+        fmt.append('B')
+        if static_size:
+            fmt.append(f'{static_size}s')
+        fmt.append(packer.format[1:] * count)
+    return struct.Struct(''.join(fmt))
+
+
+def build_crc16_table(polynomial=0xA001):
+    """Precompute the byte-at-a-time lookup table for CRC-16/IBM"""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ polynomial
+            else:
+                crc >>= 1
+        table.append(crc)
+    return table
+
+
+CRC16_TABLE = build_crc16_table()
+
+
 def test_command_api():
     """Test the command API functionality"""
     print("🔧 Testing Command API functionality...")
@@ -53,31 +165,41 @@ def test_device_commands(imei):
         {'type': 'can_control', 'name': 'mobilize', 'text': 'lvcanunblockengine'},
     ]
     
-    success_count = 0
+    headers = {'Content-Type': 'application/json'}
     
-    for cmd in test_commands:
+    def send_command(conn, cmd):
+        """Send a single command via HTTP API, returns True on success"""
         try:
             print(f"  📤 Sending {cmd['type']} - {cmd['name']}: {cmd['text']}")
             
-            # Send command via HTTP API
-            response = requests.post('http://localhost:5001/send_command', json={
+            body = json.dumps({
                 'imei': imei,
                 'command': cmd['text'],
-                'command_id': f"test_{int(time.time())}_{cmd['name']}"
-            }, timeout=10)
-            
-            if response.status_code == 200:
-                result = response.json()
-                print(f"    ✅ {result['message']}")
-                success_count += 1
+                'command_id': f"test_{int(time.time())}_{cmd['type']}_{cmd['name']}"
+            }).encode('utf-8')
+            conn.request('POST', '/send_command', body, headers)
+            response = conn.getresponse()
+            payload = response.read()
+            
+            if response.status == 200:
+                result = json.loads(payload)
+                print(f"    ✅ {cmd['name']}: {result['message']}")
+                return True
             else:
-                print(f"    ❌ Failed: HTTP {response.status_code}")
+                print(f"    ❌ {cmd['name']} failed: HTTP {response.status}")
                 
         except Exception as e:
-            print(f"    ❌ Error: {e}")
+            print(f"    ❌ {cmd['name']} error: {e}")
         
-        # Small delay between commands
-        time.sleep(1)
+        return False
+    
+    # Send the commands in order over one kept-alive connection: the service credits a
+    # device reply to the most recently sent command, so lock/unlock pairs must not overlap
+    conn = http.client.HTTPConnection('localhost', 5001, timeout=10)
+    try:
+        success_count = sum(send_command(conn, cmd) for cmd in test_commands)
+    finally:
+        conn.close()
     
     print(f"📊 Command Test Results: {success_count}/{len(test_commands)} commands sent successfully")
     return success_count == len(test_commands)
@@ -125,39 +247,58 @@ def test_django_command_api():
 class TeltonikaDeviceSimulator:
     def __init__(self, imei, server_host='127.0.0.1', server_port=5000):
         self.imei = imei
+        # Private generator so concurrent devices don't share the module-level one
+        self._rng = random.Random()
+        self._static_io = pack_static_io(STATIC_IO_DATA)
+        self._static_io_count = sum(count for count, _ in self._static_io)
+        self._static_io_size = sum(len(packed) for _, packed in self._static_io)
+        self._static_io_sizes = tuple(len(packed) for _, packed in self._static_io)
         self.server_host = server_host
         self.server_port = server_port
         self.socket = None
+        self.reader = None
+        self.writer = None
         self.connected = False
+        self.reachable = None  # Set by connect(): False when nothing is listening on the server port
+        self.response_buffer = bytearray(4)  # Reused for IMEI acceptance and ACK reads
         
     def calculate_crc16(self, data):
         """Calculate CRC-16/IBM for data validation"""
         crc = 0x0000
-        polynomial = 0xA001
+        table = CRC16_TABLE
         
         for byte in data:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x0001:
-                    crc = (crc >> 1) ^ polynomial
-                else:
-                    crc >>= 1
+            crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
         return crc
     
     def connect(self):
         """Connect to Teltonika service and send IMEI"""
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.connect((self.server_host, self.server_port))
+            # Large kernel buffers so big Codec8 batches don't stall sendall
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+            self.socket.settimeout(5)
+            try:
+                self.socket.connect((self.server_host, self.server_port))
+            except (ConnectionRefusedError, socket.timeout) as e:
+                self.reachable = False
+                self.socket.close()
+                print(f"❌ Teltonika service not reachable on {self.server_host}:{self.server_port} ({e})")
+                return False
+            self.reachable = True
+            self.socket.settimeout(None)
+            # Don't let Nagle hold back small batches waiting for the previous ACK
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             
             # Send IMEI packet
             imei_bytes = self.imei.encode('ascii')
             imei_packet = struct.pack('!H', len(imei_bytes)) + imei_bytes
-            self.socket.send(imei_packet)
+            self.socket.sendall(imei_packet)
             
             # Wait for acceptance (should receive 0x01)
-            response = self.socket.recv(1)
-            if response == b'\x01':
+            received = self.socket.recv_into(self.response_buffer, 1)
+            if received == 1 and self.response_buffer[0] == 0x01:
                 print(f"✅ Device {self.imei} connected and IMEI accepted")
                 self.connected = True
                 return True
@@ -169,292 +310,364 @@ class TeltonikaDeviceSimulator:
             print(f"❌ Connection failed for {self.imei}: {e}")
             return False
     
-    def create_gps_record(self, lat, lon, timestamp=None, speed=0, angle=0, altitude=100, satellites=8):
+    def create_gps_record(self, lat, lon, timestamp=None, speed=0, angle=0, altitude=100, satellites=8,
+                          timestamp_ms=None):
         """Create a GPS record with realistic data"""
-        if timestamp is None:
-            timestamp = datetime.now(timezone.utc)
-        
-        # Convert to Teltonika timestamp (milliseconds since epoch)
-        teltonika_timestamp = int(timestamp.timestamp() * 1000)
-        
-        # Convert coordinates to Teltonika format (degrees * 10^7)
-        lat_raw = int(lat * 10000000)
-        lon_raw = int(lon * 10000000)
+        if timestamp_ms is not None:
+            # Already a Teltonika timestamp (milliseconds since epoch)
+            teltonika_timestamp = timestamp_ms
+        else:
+            if timestamp is None:
+                timestamp = datetime.now(timezone.utc)
+            
+            # Convert to Teltonika timestamp (milliseconds since epoch)
+            teltonika_timestamp = int(timestamp.timestamp() * 1000)
         
-        # Handle negative coordinates using two's complement
-        if lat_raw < 0:
-            lat_raw = 0x100000000 + lat_raw
-        if lon_raw < 0:
-            lon_raw = 0x100000000 + lon_raw
+        # Convert coordinates to Teltonika format (degrees * 10^7), masked to
+        # 32 bits so negative values become their two's complement encoding
+        lat_raw = int(lat * 10000000) & 0xFFFFFFFF
+        lon_raw = int(lon * 10000000) & 0xFFFFFFFF
         
         return {
             'timestamp': teltonika_timestamp,
-            'priority': random.choice([0, 1, 2]),
+            'priority': self._rng.choice((0, 1, 2)),
             'longitude': lon_raw,
             'latitude': lat_raw,
             'altitude': altitude,
             'angle': angle,
             'satellites': satellites,
-            'speed': speed
+            'speed': speed,
+            'event_io_id': 0
         }
     
-    def create_io_data(self, ignition=True, movement=True, gsm_signal=4):
+    def create_io_data(self, ignition=True, movement=True, gsm_signal=4, random_row=None):
         """Create realistic IO data"""
-        io_data = {
+        if random_row is None:
+            random_row = draw_io_random_rows(1, self._rng)[0]
+        
+        (speed_gps, speed_can, pedal_position, engine_rpm, mileage_can, fuel_level,
+         mileage_counted, external_voltage, battery_voltage, battery_level,
+         battery_current, odometer, digital_input_1, gnss_pdop, gnss_hdop,
+         door_status) = random_row
+        
+        # Grouped by Codec8 element width (see IO_SIZE) so the packet
+        # builder can write each bucket without classifying values
+        io_1byte = {
             # Core status
             239: 1 if ignition else 0,  # Ignition
             240: 1 if movement else 0,  # Movement
             21: gsm_signal,  # GSM Signal (0-5)
-            69: 3,  # GNSS Status (3D Fix)
-            
-            # Speed data (both GPS and CAN)
-            24: random.randint(0, 80) if movement else 0,  # Speed (GPS)
-            81: random.randint(0, 85) if movement else 0,  # Vehicle Speed (CAN)
             
             # Vehicle CAN/OBD data
-            82: random.randint(0, 100) if movement else 0,  # Accelerator Pedal Position %
-            85: random.randint(800, 3500) if ignition else 0,  # Engine RPM (CAN)
-            87: random.randint(24800000, 24810000),  # Total Mileage (CAN) in meters
-            89: random.randint(20, 80),  # Fuel Level (CAN) %
-            105: random.randint(18070000, 18080000),  # Total Mileage Counted in meters
-            
-            # Security State Flags (IO132) - 64-bit value with byte 3 containing flags
-            132: self.create_security_flags(ignition, movement),
+            81: speed_can if movement else 0,  # Vehicle Speed (CAN)
+            82: pedal_position if movement else 0,  # Accelerator Pedal Position %
+            89: fuel_level,  # Fuel Level (CAN) %
             
             # Power and battery
-            66: random.randint(11000, 14500),  # External voltage (mV)
-            67: random.randint(3600, 4200),    # Battery voltage (mV)
-            113: random.randint(80, 100),      # Battery level (%)
-            68: random.randint(-100, 500),     # Battery current (mA)
-            
-            # Vehicle data
-            16: random.randint(100000, 999999),  # Total odometer
-            100: 1,  # Program number
+            113: battery_level,  # Battery level (%)
             
             # Digital I/O
-            1: random.choice([0, 1]),   # Digital Input 1
-            179: 0,                     # Digital Output 1
+            1: digital_input_1,         # Digital Input 1
             180: 1 if ignition else 0,  # Digital Output 2 (linked to ignition)
             
-            # GNSS quality
-            181: random.randint(10, 30),  # GNSS PDOP
-            182: random.randint(5, 15),   # GNSS HDOP
-            
-            # GSM/Cellular
-            241: 62001,  # Active GSM operator
-            
             # Door status (bit field)
-            90: random.randint(0, 15),  # Door status
+            90: door_status,  # Door status
         }
         
-        return io_data
+        io_2byte = {
+            24: speed_gps if movement else 0,  # Speed (GPS)
+            85: engine_rpm if ignition else 0,  # Engine RPM (CAN)
+            66: external_voltage,  # External voltage (mV)
+            67: battery_voltage,   # Battery voltage (mV)
+            68: battery_current & 0xFFFF,  # Battery current (mA), signed 16-bit
+            181: gnss_pdop,  # GNSS PDOP
+            182: gnss_hdop,  # GNSS HDOP
+        }
+        
+        io_4byte = {
+            87: mileage_can,  # Total Mileage (CAN) in meters
+            105: mileage_counted,  # Total Mileage Counted in meters
+            16: odometer,  # Total odometer
+        }
+        
+        io_8byte = {
+            # Security State Flags (IO132) - 64-bit value with byte 3 containing flags
+            132: self.create_security_flags(ignition, movement),
+        }
+        
+        return io_1byte, io_2byte, io_4byte, io_8byte
     
     def create_security_flags(self, ignition=True, movement=True):
         """Create realistic security state flags (IO132)"""
-        # Build byte 3 (bits 16-23) with security flags
-        byte3 = 0
+        ign = 1 if ignition else 0
+        mov = 1 if movement else 0
         
-        # Key in ignition (bit 0)
-        if ignition:
-            byte3 |= 0x01
-            
-        # Ignition on (bit 1) 
-        if ignition:
-            byte3 |= 0x02
-            
-        # Dynamic ignition on (bit 2) - sometimes active when moving
-        if movement and random.choice([True, False]):
-            byte3 |= 0x04
-            
-        # Webasto heater (bit 3) - rarely on
-        if random.randint(1, 10) == 1:
-            byte3 |= 0x08
-            
-        # Car locked (bit 4) - usually when not moving
-        if not movement and random.choice([True, False]):
-            byte3 |= 0x10
-            
-        # Car locked remote (bit 5) - sometimes when locked
-        if not movement and (byte3 & 0x10) and random.choice([True, False]):
-            byte3 |= 0x20
-            
-        # Alarm active (bit 6) - rarely
-        if random.randint(1, 20) == 1:
-            byte3 |= 0x40
-            
-        # Immobilizer (bit 7) - sometimes when ignition off
-        if not ignition and random.choice([True, False]):
-            byte3 |= 0x80
+        # One draw supplies every random decision: four coin-flip bits in
+        # bits 0-3, and two 24-bit fields for the 1-in-10 and 1-in-20 events
+        draw = self._rng.getrandbits(64)
+        coin_dynamic = draw & 1
+        coin_locked = (draw >> 1) & 1
+        coin_remote = (draw >> 2) & 1
+        coin_immobilizer = (draw >> 3) & 1
+        webasto = int(((draw >> 8) & 0xFFFFFF) % 10 == 0)
+        alarm = int(((draw >> 32) & 0xFFFFFF) % 20 == 0)
         
-        # Create full 64-bit value with flags in byte 3 (bits 16-23)
-        security_flags = byte3 << 16
+        # Build byte 3 (bits 16-23) with security flags
+        byte3 = (
+            (ign * 0x03)                                            # Key in ignition + Ignition on (bits 0-1)
+            | ((mov & coin_dynamic) << 2)                           # Dynamic ignition on (bit 2) - sometimes when moving
+            | (webasto << 3)                                        # Webasto heater (bit 3) - rarely on
+            | (((mov ^ 1) & coin_locked) << 4)                      # Car locked (bit 4) - usually when not moving
+            | (((mov ^ 1) & coin_locked & coin_remote) << 5)        # Car locked remote (bit 5) - sometimes when locked
+            | (alarm << 6)                                          # Alarm active (bit 6) - rarely
+            | (((ign ^ 1) & coin_immobilizer) << 7)                 # Immobilizer (bit 7) - sometimes when ignition off
+        )
         
-        # Add some random data in other bytes to simulate real device
-        security_flags |= random.randint(0, 0xFFFF)  # Lower 16 bits
-        security_flags |= (random.randint(0, 0xFFFFFFFF) << 24)  # Upper 32 bits
+        # Create full 64-bit value with flags in byte 3 (bits 16-23), plus
+        # random data in the lower 16 and upper 32 bits to simulate a real device
+        noise = self._rng.getrandbits(48)
+        security_flags = (byte3 << 16) | (noise & 0xFFFF) | ((noise >> 16) << 24)
         
         return security_flags
     
     def create_codec8_packet(self, gps_records):
         """Create Codec8 AVL data packet"""
         try:
-            packet = bytearray()
-            
-            # Preamble (4 bytes)
-            packet.extend(b'\x00\x00\x00\x00')
-            
-            # Data field length placeholder (will be calculated later)
-            data_start = len(packet) + 4
-            packet.extend(b'\x00\x00\x00\x00')
-            
-            # Codec ID (1 byte)
-            packet.append(0x08)  # Codec8
-            
-            # Number of data records (1 byte)
             num_records = len(gps_records)
-            packet.append(num_records)
+            static_io = self._static_io
+            static_io_sizes = self._static_io_sizes
             
-            # Data records
+            # Each record is packed by a single precompiled Struct chosen by its
+            # IO layout, so every field store happens in C in one call
+            record_packs = []
+            packet_size = 15  # preamble(4) + length(4) + codec/count(2) + count(1) + CRC(4)
             for record in gps_records:
-                # Timestamp (8 bytes)
-                packet.extend(struct.pack('!Q', record['timestamp']))
-                
-                # Priority (1 byte)
-                packet.append(record['priority'])
-                
-                # GPS element (15 bytes)
-                packet.extend(struct.pack('!I', record['longitude']))
-                packet.extend(struct.pack('!I', record['latitude']))
-                packet.extend(struct.pack('!H', record['altitude']))
-                packet.extend(struct.pack('!H', record['angle']))
-                packet.append(record['satellites'])
-                packet.extend(struct.pack('!H', record['speed']))
-                
-                # IO element
-                io_data = record.get('io_data', {})
-                
-                # Event IO ID (1 byte)
-                packet.append(record.get('event_io_id', 0))
-                
-                # Separate IO data by value size, filter only valid IDs for Codec8
-                io_1byte = {}
-                io_2byte = {}
-                io_4byte = {}
-                
-                for io_id, value in io_data.items():
-                    # Only use IO IDs that fit in Codec8 format (0-255)
-                    if not isinstance(io_id, int) or io_id > 255 or not isinstance(value, int):
-                        continue
-                        
-                    if 0 <= value <= 255:
-                        io_1byte[io_id] = value
-                    elif 256 <= value <= 65535:
-                        io_2byte[io_id] = value
-                    elif value > 65535:
-                        io_4byte[io_id] = value
-                
-                # Total IO count (1 byte)
-                total_io_count = len(io_1byte) + len(io_2byte) + len(io_4byte)
-                packet.append(total_io_count)
-                
-                # 1-byte IO elements
-                packet.append(len(io_1byte))
-                for io_id, value in io_1byte.items():
-                    packet.append(io_id)
-                    packet.append(value)
-                
-                # 2-byte IO elements
-                packet.append(len(io_2byte))
-                for io_id, value in io_2byte.items():
-                    packet.append(io_id)
-                    packet.extend(struct.pack('!H', value))
+                # IO element, already bucketed by width; flat dicts are split here
+                io_buckets = record['io_data']
+                if isinstance(io_buckets, dict):
+                    io_buckets = split_io_data(io_buckets)
                 
-                # 4-byte IO elements
-                packet.append(len(io_4byte))
-                for io_id, value in io_4byte.items():
-                    packet.append(io_id)
-                    packet.extend(struct.pack('!I', value))
-                
-                # 8-byte IO elements
-                packet.append(0)  # No 8-byte elements
+                packer = record_struct(tuple(len(bucket) for bucket in io_buckets), static_io_sizes)
+                values = [
+                    record['timestamp'],
+                    record['priority'],
+                    record['longitude'],
+                    record['latitude'],
+                    record['altitude'],
+                    record['angle'],
+                    record['satellites'],
+                    record['speed'],
+                    record['event_io_id'],
+                    self._static_io_count + sum(len(bucket) for bucket in io_buckets)
+                ]
+                for bucket, (_, _, mask), (static_count, static_packed) in zip(io_buckets, IO_WIDTHS, static_io):
+                    values.append(static_count + len(bucket))
+                    if static_packed:
+                        values.append(static_packed)
+                    for io_id, value in bucket.items():
+                        values.append(io_id)
+                        values.append(value & mask)
+                record_packs.append((packer, values))
+                packet_size += packer.size
+            buf = bytearray(packet_size)
+            
+            # Preamble (4 zero bytes) is already in place; data field starts after the length
+            data_start = 8
+            offset = data_start
+            
+            # Codec ID (1 byte) + Number of data records (1 byte)
+            buf[offset] = 0x08  # Codec8
+            buf[offset + 1] = num_records
+            offset += 2
             
-            # Number of data records (again, 1 byte)
-            packet.append(num_records)
+            # Data records
+            for packer, values in record_packs:
+                packer.pack_into(buf, offset, *values)
+                offset += packer.size
             
-            # Calculate and set data field length
-            data_length = len(packet) - data_start
-            struct.pack_into('!I', packet, 4, data_length)
+            # Number of data records (again, 1 byte)
+            buf[offset] = num_records
+            offset += 1
             
-            # Calculate and append CRC
-            crc = self.calculate_crc16(packet[8:])  # CRC from codec ID
-            packet.extend(struct.pack('!I', crc))
+            # Data field length, then CRC over the data field (from codec ID)
+            U32_STRUCT.pack_into(buf, 4, offset - data_start)
+            crc = self.calculate_crc16(memoryview(buf)[data_start:offset])
+            U32_STRUCT.pack_into(buf, offset, crc)
             
-            return bytes(packet)
+            return bytes(buf)
             
         except Exception as e:
             print(f"Error creating Codec8 packet: {e}")
             return None
     
-    def send_gps_data(self, coordinates_list, batch_size=5):
-        """Send GPS data in batches"""
+    def read_acks(self, count):
+        """Read `count` 4-byte record count ACKs into the reusable response buffer"""
+        size = 4 * count
+        if len(self.response_buffer) < size:
+            self.response_buffer = bytearray(size)
+        view = memoryview(self.response_buffer)
+        received = 0
+        while received < size:
+            chunk = self.socket.recv_into(view[received:size])
+            if not chunk:
+                raise ConnectionError("Connection closed while waiting for ACK")
+            received += chunk
+        return struct.unpack_from(f'!{count}I', self.response_buffer)
+    
+    def create_batch_records(self, batch_coords):
+        """Create GPS records with IO data for one batch of coordinates"""
+        gps_records = []
+        batch_len = len(batch_coords)
+        # Records are one minute apart, ending now (epoch milliseconds)
+        base_ms = int((datetime.now(timezone.utc) - timedelta(minutes=batch_len)).timestamp() * 1000)
+        
+        # Draw every random value the batch needs up front
+        rng = self._rng
+        speeds = rng.choices(range(0, 81), k=batch_len)
+        ignition_coins = rng.getrandbits(batch_len)  # One coin-flip bit per record
+        angles = rng.choices(range(0, 360), k=batch_len)
+        altitudes = rng.choices(range(50, 201), k=batch_len)
+        satellite_counts = rng.choices(range(6, 13), k=batch_len)
+        gsm_signals = rng.choices(range(3, 6), k=batch_len)
+        io_random_rows = draw_io_random_rows(batch_len, rng)
+        
+        for j, (lat, lon) in enumerate(batch_coords):
+            speed = speeds[j] if j % 5 != 0 else 0  # Stopped every 5th point
+            
+            # Determine vehicle state for realistic IO data
+            is_ignition_on = speed > 0 or bool((ignition_coins >> j) & 1)  # Sometimes ignition on while stopped
+            is_moving = speed > 0
+            
+            gps_record = self.create_gps_record(
+                lat=lat, 
+                lon=lon, 
+                timestamp_ms=base_ms + j * 60000,
+                speed=speed,
+                angle=angles[j],
+                altitude=altitudes[j],
+                satellites=satellite_counts[j]
+            )
+            
+            # Add IO data with realistic vehicle states
+            gps_record['io_data'] = self.create_io_data(
+                ignition=is_ignition_on,
+                movement=is_moving,
+                gsm_signal=gsm_signals[j],
+                random_row=io_random_rows[j]
+            )
+            
+            gps_records.append(gps_record)
+        
+        return gps_records
+    
+    def report_batch(self, batch_number, record_count, ack_count):
+        """Print the outcome of one batch and return the number of records acknowledged"""
+        if ack_count == record_count:
+            print(f"✅ Batch {batch_number}: {record_count} records sent, ACK received")
+            return record_count
+        print(f"❌ Batch {batch_number}: ACK mismatch (sent: {record_count}, ack: {ack_count})")
+        return 0
+    
+    def send_gps_data(self, coordinates_list, batch_size=5, pipeline_depth=1):
+        """
+        Send GPS data in batches
+        
+        Up to `pipeline_depth` packets are sent before their ACKs are read back
+        together; the service frames packets off the stream, so they may
+        arrive coalesced.
+        """
         if not self.connected:
             print(f"❌ Device {self.imei} not connected")
             return False
         
         total_sent = 0
+        pending = []  # (batch number, record count) awaiting an ACK
         
         try:
             for i in range(0, len(coordinates_list), batch_size):
-                batch_coords = coordinates_list[i:i + batch_size]
+                gps_records = self.create_batch_records(coordinates_list[i:i + batch_size])
+                
+                # Create and send packet
+                packet = self.create_codec8_packet(gps_records)
+                if packet:
+                    self.socket.sendall(packet)
+                    pending.append((i//batch_size + 1, len(gps_records)))
                 
-                # Create GPS records for this batch
-                gps_records = []
-                base_time = datetime.now(timezone.utc) - timedelta(minutes=len(batch_coords))
+                # Collect acknowledgments once the pipeline is full, or at the end
+                if pending and (len(pending) >= pipeline_depth or i + batch_size >= len(coordinates_list)):
+                    ack_counts = self.read_acks(len(pending))
+                    for (batch_number, record_count), ack_count in zip(pending, ack_counts):
+                        total_sent += self.report_batch(batch_number, record_count, ack_count)
+                    pending.clear()
+            
+            print(f"📊 Device {self.imei}: {total_sent}/{len(coordinates_list)} records sent successfully")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error sending GPS data for {self.imei}: {e}")
+            return False
+    
+    async def connect_async(self):
+        """Connect to the service and send the IMEI on the running event loop"""
+        try:
+            self.reader, self.writer = await asyncio.wait_for(
+                asyncio.open_connection(self.server_host, self.server_port), timeout=5
+            )
+        except (ConnectionRefusedError, asyncio.TimeoutError) as e:
+            self.reachable = False
+            print(f"❌ Teltonika service not reachable on {self.server_host}:{self.server_port} ({e})")
+            return False
+        
+        self.reachable = True
+        try:
+            sock = self.writer.get_extra_info('socket')
+            if sock is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            
+            # Send IMEI packet
+            imei_bytes = self.imei.encode('ascii')
+            self.writer.write(struct.pack('!H', len(imei_bytes)) + imei_bytes)
+            await self.writer.drain()
+            
+            # Wait for acceptance (should receive 0x01)
+            response = await self.reader.readexactly(1)
+            if response[0] == 0x01:
+                print(f"✅ Device {self.imei} connected and IMEI accepted")
+                self.connected = True
+                return True
+            else:
+                print(f"❌ Device {self.imei} IMEI rejected")
+                return False
                 
-                for j, (lat, lon) in enumerate(batch_coords):
-                    timestamp = base_time + timedelta(minutes=j)
-                    speed = random.randint(0, 80) if j % 5 != 0 else 0  # Stopped every 5th point
-                    
-                    # Determine vehicle state for realistic IO data
-                    is_ignition_on = speed > 0 or random.choice([True, False])  # Sometimes ignition on while stopped
-                    is_moving = speed > 0
-                    
-                    gps_record = self.create_gps_record(
-                        lat=lat, 
-                        lon=lon, 
-                        timestamp=timestamp,
-                        speed=speed,
-                        angle=random.randint(0, 359),
-                        altitude=random.randint(50, 200),
-                        satellites=random.randint(6, 12)
-                    )
-                    
-                    # Add IO data with realistic vehicle states
-                    gps_record['io_data'] = self.create_io_data(
-                        ignition=is_ignition_on,
-                        movement=is_moving,
-                        gsm_signal=random.randint(3, 5)
-                    )
-                    
-                    gps_records.append(gps_record)
+        except Exception as e:
+            print(f"❌ Connection failed for {self.imei}: {e}")
+            return False
+    
+    async def send_gps_data_async(self, coordinates_list, batch_size=5):
+        """Send GPS data in batches over the asyncio stream"""
+        if not self.connected:
+            print(f"❌ Device {self.imei} not connected")
+            return False
+        
+        total_sent = 0
+        
+        try:
+            for i in range(0, len(coordinates_list), batch_size):
+                gps_records = self.create_batch_records(coordinates_list[i:i + batch_size])
                 
                 # Create and send packet
                 packet = self.create_codec8_packet(gps_records)
                 if packet:
-                    self.socket.send(packet)
+                    self.writer.write(packet)
+                    await self.writer.drain()
                     
                     # Wait for acknowledgment
-                    ack = self.socket.recv(4)
-                    ack_count = struct.unpack('!I', ack)[0]
-                    
-                    if ack_count == len(gps_records):
-                        total_sent += len(gps_records)
-                        print(f"✅ Batch {i//batch_size + 1}: {len(gps_records)} records sent, ACK received")
-                    else:
-                        print(f"❌ Batch {i//batch_size + 1}: ACK mismatch (sent: {len(gps_records)}, ack: {ack_count})")
+                    ack = await self.reader.readexactly(4)
+                    ack_count = U32_STRUCT.unpack(ack)[0]
+                    total_sent += self.report_batch(i//batch_size + 1, len(gps_records), ack_count)
                 
                 # Small delay between batches
-                time.sleep(0.1)
+                await asyncio.sleep(0.1)
             
             print(f"📊 Device {self.imei}: {total_sent}/{len(coordinates_list)} records sent successfully")
             return True
@@ -463,6 +676,17 @@ class TeltonikaDeviceSimulator:
             print(f"❌ Error sending GPS data for {self.imei}: {e}")
             return False
     
+    async def disconnect_async(self):
+        """Close the asyncio stream"""
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except Exception:
+                pass
+            self.connected = False
+            print(f"🔌 Device {self.imei} disconnected")
+    
     def disconnect(self):
         """Disconnect from service"""
         if self.socket:
@@ -477,41 +701,36 @@ def generate_cairo_route(num_points=100):
     start_lat = 30.0444196
     start_lon = 31.2357116
     
-    coordinates = []
-    current_lat = start_lat
-    current_lon = start_lon
-    
-    for i in range(num_points):
-        # Simulate movement around Cairo with realistic GPS variations
-        lat_change = random.uniform(-0.002, 0.002)  # ~200m variation
-        lon_change = random.uniform(-0.002, 0.002)
-        
-        # Add progressive movement (simulating a journey around Cairo)
-        if i > 0:
-            progress_lat = (i / num_points) * 0.02  # Move 2km over the journey
-            progress_lon = (i / num_points) * 0.02
-            direction_change = random.uniform(-0.001, 0.001)  # Random direction changes
-            
-            current_lat = start_lat + progress_lat + lat_change + direction_change
-            current_lon = start_lon + progress_lon + lon_change + direction_change
-        else:
-            current_lat = start_lat + lat_change
-            current_lon = start_lon + lon_change
-        
-        coordinates.append((round(current_lat, 7), round(current_lon, 7)))
+    # Simulate movement around Cairo with realistic GPS variations
+    uniform = random.uniform
+    lat_changes = [uniform(-0.002, 0.002) for _ in range(num_points)]  # ~200m variation
+    lon_changes = [uniform(-0.002, 0.002) for _ in range(num_points)]
+    # Random direction changes (the first point has none)
+    direction_changes = [0.0] + [uniform(-0.001, 0.001) for _ in range(num_points - 1)]
+    
+    # Add progressive movement (simulating a journey around Cairo, 2km overall)
+    progress_step = 0.02 / num_points if num_points else 0.0
+    
+    coordinates = [
+        (round(start_lat + i * progress_step + lat_change + direction_change, 7),
+         round(start_lon + i * progress_step + lon_change + direction_change, 7))
+        for i, lat_change, lon_change, direction_change
+        in zip(range(num_points), lat_changes, lon_changes, direction_changes)
+    ]
     
     return coordinates
 
 
-def test_single_device(device_count=1, points_per_device=50):
-    """Test with a single device"""
+def test_single_device(device_count=1, points_per_device=50, device=None):
+    """Test with a single device (reuses an already connected simulator if given)"""
     print(f"🚗 Testing single device with {points_per_device} GPS points")
     
-    imei = f"86732400100{device_count:04d}"
-    device = TeltonikaDeviceSimulator(imei)
-    
-    if not device.connect():
-        return False
+    if device is None:
+        imei = f"86732400100{device_count:04d}"
+        device = TeltonikaDeviceSimulator(imei)
+        
+        if not device.connect():
+            return False
     
     # Generate route
     coordinates = generate_cairo_route(points_per_device)
@@ -526,58 +745,64 @@ def test_single_device(device_count=1, points_per_device=50):
     return success
 
 
+# Most simulated devices allowed in the connect/IMEI handshake at once, so a
+# large fleet doesn't overflow the service's listen backlog
+MAX_CONCURRENT_CONNECTS = 32
+
+
+async def device_test_worker_async(device_id, points_per_device, connect_slots):
+    """Run one simulated device on the shared event loop"""
+    imei = f"86732400100{device_id:04d}"
+    device = TeltonikaDeviceSimulator(imei)
+    
+    async with connect_slots:
+        connected = await device.connect_async()
+    
+    if connected:
+        coordinates = generate_cairo_route(points_per_device)
+        await device.send_gps_data_async(coordinates, batch_size=5)
+        await asyncio.sleep(2)  # Keep alive
+        await device.disconnect_async()
+    return device
+
+
+async def test_multiple_devices_async(device_count=3, points_per_device=20):
+    """Run every simulated device concurrently on one event loop"""
+    connect_slots = asyncio.Semaphore(max(1, min(device_count, MAX_CONCURRENT_CONNECTS)))
+    return await asyncio.gather(
+        *[device_test_worker_async(i + 1, points_per_device, connect_slots) for i in range(device_count)]
+    )
+
+
 def test_multiple_devices(device_count=3, points_per_device=20):
     """Test with multiple devices simultaneously"""
     print(f"🚛 Testing {device_count} devices with {points_per_device} points each")
     
-    devices = []
-    threads = []
-    
-    def device_test_worker(device_id):
-        imei = f"86732400100{device_id:04d}"
-        device = TeltonikaDeviceSimulator(imei)
-        devices.append(device)
-        
-        if device.connect():
-            coordinates = generate_cairo_route(points_per_device)
-            device.send_gps_data(coordinates, batch_size=5)
-            time.sleep(2)  # Keep alive
-            device.disconnect()
-    
-    # Start all devices
-    for i in range(device_count):
-        thread = threading.Thread(target=device_test_worker, args=(i+1,))
-        threads.append(thread)
-        thread.start()
-        time.sleep(0.5)  # Stagger connections
-    
-    # Wait for all devices to complete
-    for thread in threads:
-        thread.join()
+    devices = asyncio.run(test_multiple_devices_async(device_count, points_per_device))
+    connected_count = sum(1 for device in devices if device.reachable)
     
-    print(f"✅ All {device_count} devices completed testing")
+    print(f"✅ All {device_count} devices completed testing ({connected_count} reached the service)")
 
 
-def test_service_availability():
-    """Test if Teltonika service is running"""
+def test_service_availability(device_count=1):
+    """
+    Test if Teltonika service is running by connecting the first simulated device
+    
+    Returns the connected simulator so the first test can reuse its socket,
+    or None if the service is not available.
+    """
     print("🔍 Testing Teltonika service availability...")
     
-    try:
-        test_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        test_socket.settimeout(5)
-        result = test_socket.connect_ex(('127.0.0.1', 5000))
-        test_socket.close()
-        
-        if result == 0:
-            print("✅ Teltonika service is running on port 5000")
-            return True
-        else:
-            print("❌ Teltonika service is not running on port 5000")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Error testing service: {e}")
-        return False
+    device = TeltonikaDeviceSimulator(f"86732400100{device_count:04d}")
+    if device.connect():
+        print("✅ Teltonika service is running on port 5000")
+        return device
+    
+    if device.reachable:
+        print("❌ Teltonika service is running on port 5000 but rejected the device")
+    else:
+        print("❌ Teltonika service is not running on port 5000")
+    return None
 
 
 def main():
@@ -595,8 +820,9 @@ def main():
     print("  🆕 Command history tracking")
     print("")
     
-    # Test service availability
-    if not test_service_availability():
+    # Test service availability (the probe connection is reused by TEST 1)
+    first_device = test_service_availability(device_count=1)
+    if not first_device:
         print("\n💡 To start the service, run:")
         print("   python teltonika_service.py")
         return
@@ -611,7 +837,7 @@ def main():
     print("TEST 1: Single Device with Enhanced Data (50 GPS points)")
     print("        → Testing all new IO parameters and security flags")
     device_imei = "867324001001001"
-    test_single_device(device_count=1, points_per_device=50)
+    test_single_device(device_count=1, points_per_device=50, device=first_device)
     
     # Test command functionality if API is available
     if command_api_available: